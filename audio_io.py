@@ -0,0 +1,484 @@
+import math
+import struct
+import functools
+import numpy as np
+from fractions import Fraction
+from typing import Optional, Dict, Any, Union, Iterator, Tuple, Sequence
+
+# Whisper models expect 16 kHz mono float32 audio in [-1.0, 1.0]
+WHISPER_SAMPLE_RATE = 16000
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Sample rates StreamingResampler accepts; header and request rates come
+# from clients, so anything outside this range is rejected
+MIN_SAMPLE_RATE = 4000
+MAX_SAMPLE_RATE = 384000
+
+
+def pcm_to_float32(pcm: Union[bytes, memoryview], sample_width: int = 2, channels: int = 1,
+                   is_float: bool = False) -> np.ndarray:
+    """
+    Convert interleaved little-endian PCM samples to a mono float32 array
+    
+    The raw buffer is wrapped with np.frombuffer (no copy); the only
+    allocation is the float32 output itself.
+    
+    Args:
+        pcm: Raw PCM sample data
+        sample_width: Bytes per sample (1, 2, 4, or 4/8 for float data)
+        channels: Number of interleaved channels
+        is_float: True if the samples are IEEE floats rather than integers
+    
+    Returns:
+        Mono float32 samples in [-1.0, 1.0]
+    """
+    buffer = memoryview(pcm).cast('B')
+    frame_size = sample_width * channels
+    # Drop a trailing partial frame instead of failing on truncated input
+    buffer = buffer[:len(buffer) - len(buffer) % frame_size]
+    
+    if is_float and sample_width in (4, 8):
+        samples = np.frombuffer(buffer, dtype='<f4' if sample_width == 4 else '<f8').astype(np.float32)
+    elif sample_width == 1:
+        samples = (np.frombuffer(buffer, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        samples = np.frombuffer(buffer, dtype='<i2').astype(np.float32) / 32768.0
+    elif sample_width == 4:
+        samples = np.frombuffer(buffer, dtype='<i4').astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width} bytes")
+    
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    
+    return samples
+
+
+def downmix(audio: np.ndarray) -> np.ndarray:
+    """
+    Average a (frames, channels) array to mono float32 (1-D input is returned as float32)
+    """
+    audio = np.asarray(audio)
+    if audio.ndim == 2:
+        return audio.mean(axis=1, dtype=np.float32)
+    return audio.astype(np.float32, copy=False)
+
+
+class StreamingResampler:
+    """
+    Polyphase windowed-sinc resampler for streams of mono float32 audio
+    
+    The rate ratio is reduced to up/down integers and a Kaiser-windowed sinc
+    table is precomputed with one row per output phase, so every output
+    sample is a single dot product with the input around it. Outputs are
+    computed in vectorised blocks and the cost per sample is constant.
+    Ratios that would need more than MAX_PHASES phases (rates with no large
+    common factor with the output rate, e.g. 44099 Hz) are approximated by
+    the closest ratio that doesn't, a rate error under 0.05%.
+    Tables are shared between resamplers with the same ratio.
+    Chunks of any size can be fed; output is aligned with the input (no
+    filter delay) once flush() has been called.
+    """
+    
+    # Outputs computed per vectorised block (bounds the temporary matrix)
+    BLOCK = 8192
+    # Most phases in a table; exact for all common rates (44.1 kHz needs 160, 11.025 kHz 640)
+    MAX_PHASES = 1024
+    
+    def __init__(self, input_rate: int, output_rate: int = WHISPER_SAMPLE_RATE,
+                 zero_crossings: int = 16, rolloff: float = 0.94, beta: float = 8.6):
+        """
+        Args:
+            input_rate: Sample rate of the input in Hz
+            output_rate: Sample rate of the output in Hz
+            zero_crossings: Sinc zero crossings on each side (filter quality)
+            rolloff: Cutoff as a fraction of the lower Nyquist frequency
+            beta: Kaiser window shape (higher attenuates more, with a wider transition)
+        """
+        for rate in (input_rate, output_rate):
+            if not MIN_SAMPLE_RATE <= rate <= MAX_SAMPLE_RATE:
+                raise ValueError(f"Unsupported sample rate: {rate} Hz "
+                                 f"(expected {MIN_SAMPLE_RATE}-{MAX_SAMPLE_RATE} Hz)")
+        
+        # down/up approximates input_rate/output_rate with at most MAX_PHASES phases
+        ratio = Fraction(input_rate, output_rate).limit_denominator(self.MAX_PHASES)
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.up = ratio.denominator
+        self.down = ratio.numerator
+        self.taps, self.table = _polyphase_table(self.up, self.down, zero_crossings, rolloff, beta)
+        self.reset()
+    
+    def reset(self):
+        """
+        Drop any buffered audio and start a new stream
+        """
+        # History of taps/2 - 1 zeros so the first output is centred on the first input
+        self._buffer = np.zeros(self.taps // 2 - 1, dtype=np.float32)
+        self._position = 0
+        self._samples_in = 0
+        self._samples_out = 0
+    
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Resample the next chunk of a stream
+        
+        Args:
+            audio: Mono float32 samples, or a (frames, channels) array that is downmixed
+        
+        Returns:
+            Output samples that can be computed so far
+        """
+        audio = downmix(audio)
+        self._samples_in += len(audio)
+        if self.up == self.down:
+            self._samples_out += len(audio)
+            return audio
+        
+        buffer = np.concatenate((self._buffer, audio)) if len(self._buffer) else audio
+        # Last position (in 1/up input samples) whose taps are all in the buffer
+        last = (len(buffer) - self.taps + 1) * self.up - 1
+        count = (last - self._position) // self.down + 1 if last >= self._position else 0
+        
+        output = np.empty(count, dtype=np.float32)
+        if count:
+            windows = np.lib.stride_tricks.sliding_window_view(buffer, self.taps)
+            for start in range(0, count, self.BLOCK):
+                positions = self._position + self.down * np.arange(start, min(start + self.BLOCK, count))
+                np.einsum('ij,ij->i', windows[positions // self.up], self.table[positions % self.up],
+                          out=output[start:start + len(positions)])
+        
+        # Keep only the input still needed by future outputs
+        position = self._position + count * self.down
+        consumed = min(position // self.up, len(buffer))
+        self._buffer = buffer[consumed:].copy()
+        self._position = position - consumed * self.up
+        self._samples_out += count
+        return output
+    
+    def flush(self) -> np.ndarray:
+        """
+        Return the output still held back by the filter, ending the stream
+        """
+        expected = -(-self._samples_in * self.up // self.down)
+        remaining = expected - self._samples_out
+        if remaining <= 0:
+            return np.zeros(0, dtype=np.float32)
+        
+        samples_in = self._samples_in
+        output = self.process(np.zeros(self.taps, dtype=np.float32))[:remaining]
+        self._samples_in = samples_in
+        self._samples_out = expected
+        return output
+
+
+@functools.lru_cache(maxsize=32)
+def _polyphase_table(up: int, down: int, zero_crossings: int, rolloff: float,
+                     beta: float) -> Tuple[int, np.ndarray]:
+    """
+    Kaiser-windowed sinc weights for StreamingResampler, one row per phase
+    
+    Returns:
+        (taps, read-only (up, taps) float32 table)
+    """
+    # Cutoff in cycles per input sample, below both Nyquist frequencies
+    cutoff = 0.5 * rolloff * min(1.0, up / down)
+    half_width = zero_crossings / (2.0 * cutoff)
+    taps = 2 * int(math.ceil(half_width))
+    
+    # Row p holds the weights for an output p/up of an input sample past
+    # its base sample; taps run from base - (taps/2 - 1) to base + taps/2
+    offsets = (np.arange(up)[:, None] / up
+               + (taps // 2 - 1) - np.arange(taps)[None, :])
+    window = np.i0(beta * np.sqrt(np.clip(1.0 - (offsets / (taps // 2)) ** 2, 0.0, 1.0))) / np.i0(beta)
+    table = 2 * cutoff * np.sinc(2 * cutoff * offsets) * window
+    # Normalise every phase to unity DC gain
+    table = (table / table.sum(axis=1, keepdims=True)).astype(np.float32)
+    table.flags.writeable = False
+    return taps, table
+
+
+def resample(audio: np.ndarray, input_rate: int, output_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """
+    Resample a complete mono recording (multi-channel (frames, channels) input is downmixed)
+    
+    Returns:
+        Float32 samples at output_rate
+    """
+    if input_rate == output_rate:
+        return downmix(audio)
+    resampler = StreamingResampler(input_rate, output_rate)
+    return np.concatenate((resampler.process(audio), resampler.flush()))
+
+
+class AudioPipeline:
+    """
+    Chain of streaming stages, each with process(audio) and flush()
+    """
+    
+    def __init__(self, stages: Sequence = ()):
+        """
+        Args:
+            stages: Stages applied in order (e.g. a StreamingResampler, then a denoiser)
+        """
+        self.stages = [stage for stage in stages if stage is not None]
+    
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        for stage in self.stages:
+            audio = stage.process(audio)
+        return audio
+    
+    def flush(self) -> np.ndarray:
+        """
+        Drain every stage, passing each one's remaining output through the rest
+        """
+        audio = np.zeros(0, dtype=np.float32)
+        for stage in self.stages:
+            audio = np.concatenate((stage.process(audio), stage.flush()))
+        return audio
+
+
+def parse_wav_header(header: Union[bytes, memoryview]) -> Optional[Dict[str, Any]]:
+    """
+    Parse the RIFF/WAVE header at the start of a WAV file
+    
+    Args:
+        header: The first bytes of the file, up to and including the data chunk header
+    
+    Returns:
+        Dictionary with format details plus 'data_offset' and 'data_size' of
+        the sample data, or None if the data is not an uncompressed PCM/float
+        WAV file (or the data chunk isn't within the given bytes)
+    """
+    view = memoryview(header).cast('B')
+    if len(view) < 12 or view[0:4] != b'RIFF' or view[8:12] != b'WAVE':
+        return None
+    
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        chunk_size = struct.unpack_from('<I', view, offset + 4)[0]
+        body = offset + 8
+        
+        if chunk_id == b'fmt ' and chunk_size >= 16 and body + 16 <= len(view):
+            audio_format, channels, sample_rate, _, _, bits = struct.unpack_from('<HHIIHH', view, body)
+            if audio_format == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26 and body + 26 <= len(view):
+                # The real format tag is the first two bytes of the sub-format GUID
+                audio_format = struct.unpack_from('<H', view, body + 24)[0]
+            fmt = {
+                'format': audio_format,
+                'channels': channels,
+                'sample_rate': sample_rate,
+                'sample_width': bits // 8,
+            }
+        elif chunk_id == b'data':
+            if fmt is None or fmt['format'] not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+                return None
+            if fmt['channels'] < 1 or fmt['sample_width'] < 1:
+                return None
+            fmt['data_offset'] = body
+            fmt['data_size'] = chunk_size
+            return fmt
+        
+        # Chunks are word aligned
+        offset = body + chunk_size + (chunk_size & 1)
+    
+    return None
+
+
+def parse_wav_bytes(audio_data: Union[bytes, memoryview]) -> Optional[Dict[str, Any]]:
+    """
+    Parse the RIFF/WAVE header of an in-memory WAV file
+    
+    Args:
+        audio_data: Complete WAV file contents
+    
+    Returns:
+        Dictionary with format details and a memoryview of the sample data,
+        or None if the data is not an uncompressed PCM/float WAV file
+    """
+    wav = parse_wav_header(audio_data)
+    if wav is None:
+        return None
+    
+    view = memoryview(audio_data).cast('B')
+    # Streaming writers may leave the size unset, so clamp to what we have
+    end = min(wav['data_offset'] + wav['data_size'], len(view))
+    wav['data'] = view[wav['data_offset']:end]
+    return wav
+
+
+def wav_bytes_to_float32(audio_data: Union[bytes, memoryview]) -> Optional[np.ndarray]:
+    """
+    Decode an in-memory WAV file to 16 kHz mono float32 without ffmpeg
+    
+    Other sample rates are resampled and multi-channel audio is downmixed.
+    
+    Args:
+        audio_data: Complete WAV file contents
+    
+    Returns:
+        Float32 samples ready for Whisper, or None if the data needs ffmpeg
+        (compressed container or an unsupported sample format)
+    """
+    wav = parse_wav_bytes(audio_data)
+    if wav is None or wav['sample_rate'] <= 0:
+        return None
+    
+    try:
+        samples = pcm_to_float32(wav['data'], wav['sample_width'], wav['channels'],
+                                 is_float=wav['format'] == WAVE_FORMAT_IEEE_FLOAT)
+    except ValueError:
+        return None
+    return resample(samples, wav['sample_rate'])
+
+
+def quiet_cut(window: np.ndarray, snap_samples: int, hop: int) -> int:
+    """
+    Where to end a window so the cut falls in a quiet stretch
+    
+    Args:
+        window: Mono samples of the full-length window
+        snap_samples: How far back from the end the cut may move (0 disables)
+        hop: Frame length in samples over which energy is measured
+    
+    Returns:
+        Length of the window after the end of its quietest frame in the last
+        snap_samples samples (the full length if the window is too short)
+    """
+    if not 0 < snap_samples < len(window):
+        return len(window)
+    tail = window[-snap_samples:]
+    n_hops = len(tail) // hop
+    if n_hops <= 1:
+        return len(window)
+    energy = np.square(tail[:n_hops * hop].reshape(n_hops, hop)).sum(axis=1)
+    return len(window) - snap_samples + (int(np.argmin(energy)) + 1) * hop
+
+
+class WavStreamReader:
+    """
+    Memory-mapped reader for large uncompressed WAV files
+    
+    Samples are only paged in and converted to float32 one window at a
+    time, so memory use stays bounded regardless of the file's duration.
+    """
+    
+    # Enough to cover the fmt chunk plus typical LIST/metadata chunks before the data
+    HEADER_BYTES = 1 << 16
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path to a PCM or IEEE float WAV file
+        
+        Raises:
+            ValueError: If the file is not an uncompressed WAV file, or its
+                sample format isn't one pcm_to_float32 can convert
+        """
+        with open(path, 'rb') as f:
+            header = f.read(self.HEADER_BYTES)
+            file_size = f.seek(0, 2)
+        
+        wav = parse_wav_header(header)
+        if wav is None:
+            raise ValueError(f"Not an uncompressed WAV file: {path}")
+        
+        # Reject formats read() can't convert (e.g. 24-bit PCM) up front, so
+        # open() returns None and callers fall back to another decoder
+        is_float = wav['format'] == WAVE_FORMAT_IEEE_FLOAT
+        supported_widths = (4, 8) if is_float else (1, 2, 4)
+        if wav['sample_width'] not in supported_widths or wav['channels'] < 1:
+            raise ValueError(f"Unsupported WAV sample format: {wav['sample_width']} bytes, "
+                             f"{wav['channels']} channel(s)")
+        
+        self.path = path
+        self.sample_rate = wav['sample_rate']
+        self.channels = wav['channels']
+        self.sample_width = wav['sample_width']
+        self.is_float = is_float
+        self.frame_size = self.sample_width * self.channels
+        
+        data_size = min(wav['data_size'], file_size - wav['data_offset'])
+        self.num_frames = max(data_size, 0) // self.frame_size
+        self._data = (np.memmap(path, dtype=np.uint8, mode='r', offset=wav['data_offset'],
+                                shape=(self.num_frames * self.frame_size,))
+                      if self.num_frames else np.zeros(0, dtype=np.uint8))
+    
+    @classmethod
+    def open(cls, path: str) -> Optional['WavStreamReader']:
+        """
+        Open a file if it is an uncompressed WAV file
+        
+        Returns:
+            Reader, or None if the file needs another decoder
+        """
+        try:
+            return cls(path)
+        except (OSError, ValueError):
+            return None
+    
+    @property
+    def duration(self) -> float:
+        return self.num_frames / self.sample_rate
+    
+    def read(self, start: int, count: int) -> np.ndarray:
+        """
+        Read frames as mono float32
+        
+        Args:
+            start: First frame
+            count: Number of frames (fewer are returned at the end of the file)
+        
+        Returns:
+            Mono float32 samples at the file's sample rate
+        """
+        start = min(max(start, 0), self.num_frames)
+        end = min(start + max(count, 0), self.num_frames)
+        return pcm_to_float32(self._data[start * self.frame_size:end * self.frame_size],
+                              self.sample_width, self.channels, self.is_float)
+    
+    def iter_windows(self, window_duration: float = 30.0,
+                     snap_duration: float = 2.0) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Yield consecutive windows of the file
+        
+        Each window boundary is moved back to the quietest 10 ms frame within
+        the last snap_duration seconds, so words are less likely to be cut.
+        
+        Args:
+            window_duration: Maximum window length in seconds
+            snap_duration: How far back a boundary may move, in seconds (0 disables)
+        
+        Yields:
+            (start_frame, samples) tuples
+        """
+        window_frames = int(window_duration * self.sample_rate)
+        snap_frames = int(snap_duration * self.sample_rate)
+        hop = max(self.sample_rate // 100, 1)
+        
+        start = 0
+        while start < self.num_frames:
+            window = self.read(start, window_frames)
+            
+            if start + len(window) < self.num_frames:
+                window = window[:quiet_cut(window, snap_frames, hop)]
+            
+            yield start, window
+            start += len(window)
+    
+    def close(self):
+        """
+        Release the memory map (it is unmapped once no window still refers to it)
+        """
+        self._data = np.zeros(0, dtype=np.uint8)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,217 @@
+import os
+import whisper
+import numpy as np
+import torch
+from typing import Optional, Dict, Any, Union, Tuple
+
+try:
+    import faster_whisper
+except ImportError:
+    faster_whisper = None
+
+WHISPER_BACKEND = "whisper"
+FASTER_WHISPER_BACKEND = "faster-whisper"
+
+# Precisions each backend can run, the first one being the default
+BACKEND_DTYPES = {
+    WHISPER_BACKEND: ('float32', 'float16', 'int8'),
+    FASTER_WHISPER_BACKEND: ('int8', 'int8_float32', 'int8_float16', 'float16', 'float32'),
+}
+
+
+def default_dtype(backend: str) -> str:
+    """
+    Precision used when none is requested (float32 for PyTorch, int8 for CTranslate2)
+    """
+    validate_backend(backend)
+    return BACKEND_DTYPES[backend][0]
+
+
+def validate_backend(backend: str, device: Optional[str] = None, dtype: Optional[str] = None):
+    """
+    Check that a backend supports the requested device and precision
+    
+    Raises:
+        ValueError: If the combination is not supported
+    """
+    if backend not in BACKEND_DTYPES:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {tuple(BACKEND_DTYPES)}")
+    if dtype is not None and dtype not in BACKEND_DTYPES[backend]:
+        raise ValueError(f"Unsupported dtype '{dtype}' for the {backend} backend, "
+                         f"expected one of {BACKEND_DTYPES[backend]}")
+    if dtype is not None and 'float16' in dtype and device is not None and not device.startswith("cuda"):
+        raise ValueError(f"{dtype} models require a CUDA device")
+    if backend == WHISPER_BACKEND and dtype == "int8" and device is not None and device != "cpu":
+        raise ValueError("int8 PyTorch models are dynamically quantized and only run on the CPU")
+
+
+def quantized_cache_dir() -> str:
+    """
+    Directory holding quantized weights (next to Whisper's own download cache)
+    """
+    default = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(os.getenv("XDG_CACHE_HOME", default), "whisper", "quantized")
+
+
+def _quantize_linear_layers(model):
+    """
+    Replace the model's linear layers with dynamically quantized int8 ones, in place
+    """
+    # Whisper's Linear subclass only casts weights to the input dtype, which
+    # doesn't matter in float32, but quantize_dynamic only converts exact
+    # nn.Linear modules
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def load_quantized_whisper(model_size: str, cache_dir: Optional[str] = None):
+    """
+    Load a Whisper model with int8 linear layers on the CPU
+    
+    The quantized weights are saved on first use, so later loads skip both
+    the float32 checkpoint and the quantization pass.
+    
+    Args:
+        model_size: Whisper model size (tiny, base, small, medium, large)
+        cache_dir: Where quantized weights are kept (default: quantized_cache_dir())
+    
+    Returns:
+        Quantized Whisper model
+    """
+    cache_dir = cache_dir or quantized_cache_dir()
+    # Packed int8 weights are not guaranteed to load across torch versions
+    path = os.path.join(cache_dir, f"{model_size}-int8-torch{torch.__version__.split('+')[0]}.pt")
+    
+    if os.path.exists(path):
+        try:
+            checkpoint = torch.load(path, map_location="cpu", weights_only=False)
+            model = whisper.model.Whisper(whisper.model.ModelDimensions(**checkpoint['dims']))
+            _quantize_linear_layers(model)
+            model.load_state_dict(checkpoint['state_dict'])
+            if model_size in whisper._ALIGNMENT_HEADS:
+                model.set_alignment_heads(whisper._ALIGNMENT_HEADS[model_size])
+            return model.eval()
+        except Exception:
+            # Stale or truncated file; quantize again and overwrite it
+            pass
+    
+    model = _quantize_linear_layers(whisper.load_model(model_size, device="cpu")).eval()
+    
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        torch.save({'dims': vars(model.dims), 'state_dict': model.state_dict()}, temp_path)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+    return model
+
+
+def load_model(backend: str, model_size: str, device: str, dtype: str):
+    """
+    Load a model for the given backend
+    
+    Returns:
+        A Whisper model, or a FasterWhisperModel for the faster-whisper backend
+    """
+    validate_backend(backend, device, dtype)
+    
+    if backend == FASTER_WHISPER_BACKEND:
+        return FasterWhisperModel(model_size, device, dtype)
+    if dtype == "int8":
+        return load_quantized_whisper(model_size)
+    
+    model = whisper.load_model(model_size, device=device)
+    if dtype == "float16":
+        model = model.half()
+    return model
+
+
+class FasterWhisperModel:
+    """
+    CTranslate2 (faster-whisper) model with the same transcribe output as openai-whisper
+    
+    transcribe() returns the dictionary whisper.transcribe returns, so
+    gmtSpeechReco builds identical result dicts on either backend.
+    """
+    
+    # whisper.transcribe options that have no faster-whisper equivalent
+    UNSUPPORTED_OPTIONS = ('verbose', 'fp16')
+    
+    def __init__(self, model_size: str, device: str = "cpu", compute_type: str = "int8"):
+        """
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large-v2, ...)
+            device: "cpu", "cuda" or "cuda:<index>"
+            compute_type: CTranslate2 compute type (int8, int8_float16, float16, ...)
+        """
+        if faster_whisper is None:
+            raise ImportError("faster-whisper is not installed. Install it with: pip install faster-whisper")
+        
+        device_type, _, index = device.partition(':')
+        self._model = faster_whisper.WhisperModel(model_size, device=device_type,
+                                                  device_index=int(index) if index else 0,
+                                                  compute_type=compute_type)
+        self.device = device
+        self.compute_type = compute_type
+    
+    def transcribe(self, audio: Union[str, np.ndarray], **options) -> Dict[str, Any]:
+        """
+        Transcribe a file path or 16 kHz float32 array
+        
+        Returns:
+            Dictionary with 'text', 'segments' and 'language' like whisper.transcribe
+        """
+        for name in self.UNSUPPORTED_OPTIONS:
+            options.pop(name, None)
+        
+        segments, info = self._model.transcribe(audio, **options)
+        
+        output = []
+        for segment in segments:
+            item = {
+                'id': len(output),
+                'seek': segment.seek,
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'tokens': list(segment.tokens),
+                'temperature': segment.temperature,
+                'avg_logprob': segment.avg_logprob,
+                'compression_ratio': segment.compression_ratio,
+                'no_speech_prob': segment.no_speech_prob,
+            }
+            if segment.words:
+                item['words'] = [{'word': word.word, 'start': word.start, 'end': word.end,
+                                  'probability': word.probability} for word in segment.words]
+            output.append(item)
+        
+        return {
+            'text': ''.join(segment['text'] for segment in output),
+            'segments': output,
+            'language': info.language,
+        }
+    
+    def detect_language(self, audio: np.ndarray) -> Tuple[str, Dict[str, float]]:
+        """
+        Detect the language from the first 30 seconds of audio
+        
+        Args:
+            audio: 16 kHz mono float32 samples
+        
+        Returns:
+            (language code, probabilities by language code)
+        """
+        extractor = self._model.feature_extractor
+        features = extractor(audio[:whisper.audio.N_SAMPLES])[:, :extractor.nb_max_frames]
+        # The encoder expects exactly one 30-second window of frames
+        features = np.pad(features, ((0, 0), (0, extractor.nb_max_frames - features.shape[1])))
+        encoder_output = self._model.encode(features)
+        results = self._model.model.detect_language(encoder_output)[0]
+        
+        # Tokens look like "<|en|>"
+        probs = {token[2:-2]: probability for token, probability in results}
+        return max(probs, key=probs.get), probs
@@ -0,0 +1,366 @@
+import os
+import sys
+import json
+import time
+import wave
+import platform
+import argparse
+import tempfile
+import multiprocessing
+import numpy as np
+import torch
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, Any, List, Sequence
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from speechrecogniation import gmtSpeechReco, ModelRegistry, WHISPER_SAMPLE_RATE
+from vad import UtteranceSegmenter
+
+# Lengths of the generated test clips in seconds
+DEFAULT_DURATIONS = (5.0, 15.0, 30.0)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Word error rate of a hypothesis against a reference transcript
+    
+    Returns:
+        (substitutions + deletions + insertions) / reference words
+    """
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    
+    # Levenshtein distance over words, one row at a time
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def _timed_transcriptions(recognizer: gmtSpeechReco, paths: Sequence[str],
+                          language: Optional[str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    recognizer.registry.preload(recognizer.model_size, recognizer.device, recognizer.dtype, recognizer.backend)
+    load_seconds = time.perf_counter() - started
+    
+    texts = []
+    started = time.perf_counter()
+    for path in paths:
+        result = recognizer.transcribe_audio(path, language)
+        if not result['success']:
+            raise RuntimeError(f"Transcribing {path} failed: {result['error']}")
+        texts.append(result['text'])
+    
+    return {'load_seconds': load_seconds, 'transcribe_seconds': time.perf_counter() - started, 'texts': texts}
+
+
+def compare_quantization(model_size: str, paths: Sequence[str], language: Optional[str] = None,
+                         max_wer: float = 0.05) -> Dict[str, Any]:
+    """
+    Check the int8 model's accuracy and speed against the float32 model on the CPU
+    
+    Args:
+        model_size: Whisper model size (tiny, base, small, medium, large)
+        paths: Audio files to transcribe with both models
+        language: Language code (optional, auto-detect if not provided)
+        max_wer: Largest mean word error rate of int8 against float32 that passes
+    
+    Returns:
+        Report with per-file and mean WER, load and transcription times and 'passed'
+    """
+    # A private registry so the two models don't evict anything shared
+    registry = ModelRegistry(max_models=1)
+    reference = _timed_transcriptions(gmtSpeechReco(model_size, device="cpu", registry=registry),
+                                      paths, language)
+    registry.unload()
+    quantized = _timed_transcriptions(gmtSpeechReco(model_size, registry=registry, quantize="int8"),
+                                      paths, language)
+    registry.unload()
+    
+    files = [{'path': path, 'wer': word_error_rate(ref, hyp), 'float32': ref, 'int8': hyp}
+             for path, ref, hyp in zip(paths, reference['texts'], quantized['texts'])]
+    mean_wer = sum(item['wer'] for item in files) / len(files) if files else 0.0
+    
+    return {
+        'model_size': model_size,
+        'mean_wer': mean_wer,
+        'max_wer': max_wer,
+        'passed': mean_wer <= max_wer,
+        'load_seconds': {'float32': reference['load_seconds'], 'int8': quantized['load_seconds']},
+        'transcribe_seconds': {'float32': reference['transcribe_seconds'],
+                               'int8': quantized['transcribe_seconds']},
+        'speedup': (reference['transcribe_seconds'] / quantized['transcribe_seconds']
+                    if quantized['transcribe_seconds'] else None),
+        'files': files,
+    }
+
+
+def synthetic_speech(duration: float, seed: int = 0) -> np.ndarray:
+    """
+    Generate speech-like test audio: voiced bursts separated by pauses over low noise
+    
+    Each burst is a harmonic tone with a wandering pitch and a syllable-rate
+    envelope, which is enough to exercise the VAD, the segmenter and every
+    model stage. The model's output on it is meaningless; use real
+    recordings for accuracy.
+    
+    Args:
+        duration: Length in seconds
+        seed: Random seed, so runs are comparable
+    
+    Returns:
+        16 kHz mono float32 samples
+    """
+    rng = np.random.default_rng(seed)
+    n_samples = int(duration * WHISPER_SAMPLE_RATE)
+    audio = rng.normal(0.0, 0.003, n_samples).astype(np.float32)
+    
+    position = int(rng.uniform(0.2, 0.6) * WHISPER_SAMPLE_RATE)
+    while position < n_samples:
+        length = min(int(rng.uniform(0.8, 2.5) * WHISPER_SAMPLE_RATE), n_samples - position)
+        t = np.arange(length) / WHISPER_SAMPLE_RATE
+        pitch = rng.uniform(100, 220) * (1.0 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.5, 2) * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / WHISPER_SAMPLE_RATE
+        burst = sum(np.sin(k * phase) / k for k in range(1, 8))
+        envelope = 0.5 * (1 - np.cos(2 * np.pi * rng.uniform(3, 6) * t)) * np.hanning(length)
+        audio[position:position + length] += (0.1 * burst * envelope).astype(np.float32)
+        position += length + int(rng.uniform(0.4, 1.2) * WHISPER_SAMPLE_RATE)
+    
+    return audio
+
+
+def write_wav(path: str, audio: np.ndarray):
+    """
+    Save 16 kHz mono float32 samples as 16-bit PCM WAV
+    """
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(WHISPER_SAMPLE_RATE)
+        wf.writeframes((np.clip(audio, -1.0, 1.0) * 32767).astype('<i2').tobytes())
+
+
+def latency_stats(seconds: Sequence[float], audio_seconds: float) -> Dict[str, Any]:
+    """
+    Summarise call latencies
+    
+    Args:
+        seconds: Wall time of each call
+        audio_seconds: Total audio those calls processed
+    
+    Returns:
+        Call count, real-time factor (processing time / audio time) and
+        mean/p50/p95/p99/max latency in seconds
+    """
+    if not seconds:
+        return {'count': 0}
+    
+    values = np.asarray(seconds, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': len(values),
+        'rtf': float(values.sum() / audio_seconds) if audio_seconds else None,
+        'mean': float(values.mean()),
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'max': float(values.max()),
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident memory of this process in MiB (None where unavailable)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _replay_realtime(recognizer: gmtSpeechReco, audio: np.ndarray, language: Optional[str],
+                     block_duration: float = 0.1) -> List[float]:
+    """
+    Feed audio through the utterance segmenter as the microphone loop would
+    
+    Returns:
+        Seconds from the end of each utterance to its result
+    """
+    segmenter = UtteranceSegmenter()
+    block = int(WHISPER_SAMPLE_RATE * block_duration)
+    latencies = []
+    
+    def transcribe(utterance):
+        started = time.perf_counter()
+        recognizer.transcribe_array(utterance, language)
+        latencies.append(time.perf_counter() - started)
+    
+    for start in range(0, len(audio), block):
+        for utterance in segmenter.feed(audio[start:start + block]):
+            transcribe(utterance)
+    utterance = segmenter.flush()
+    if utterance is not None:
+        transcribe(utterance)
+    return latencies
+
+
+def _bench_config(model_size: str, threads: int, paths: Sequence[str], repeats: int,
+                  language: Optional[str], dtype: Optional[str], backend: str) -> Dict[str, Any]:
+    """
+    Benchmark one model size and thread count (runs in its own process)
+    """
+    torch.set_num_threads(threads)
+    
+    started = time.perf_counter()
+    recognizer = gmtSpeechReco(model_size, dtype=dtype, backend=backend, preload=True)
+    load_seconds = time.perf_counter() - started
+    
+    clips = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        audio = recognizer._load_input(path)
+        clips.append((path, data, audio, len(audio) / WHISPER_SAMPLE_RATE))
+    
+    # Warm up once so one-off initialisation doesn't land in the first sample
+    recognizer.transcribe_array(clips[0][2][:WHISPER_SAMPLE_RATE], language)
+    
+    timings = {'transcribe_audio': [], 'transcribe_audio_data': [], 'detect_language': [], 'realtime': []}
+    audio_seconds = {name: 0.0 for name in timings}
+    
+    def timed(name, function, *args):
+        started = time.perf_counter()
+        result = function(*args)
+        timings[name].append(time.perf_counter() - started)
+        return result
+    
+    errors = 0
+    for _ in range(max(1, repeats)):
+        for path, data, audio, duration in clips:
+            errors += not timed('transcribe_audio', recognizer.transcribe_audio, path, language)['success']
+            errors += not timed('transcribe_audio_data', recognizer.transcribe_audio_data, data, language)['success']
+            errors += timed('detect_language', recognizer.detect_language, path) == 'unknown'
+            timings['realtime'].extend(_replay_realtime(recognizer, audio, language))
+            for name in audio_seconds:
+                audio_seconds[name] += duration
+    
+    report = {
+        'model_size': model_size,
+        'backend': recognizer.backend,
+        'dtype': recognizer.dtype,
+        'device': recognizer.device,
+        'threads': threads,
+        'load_seconds': load_seconds,
+        'errors': errors,
+    }
+    for name, seconds in timings.items():
+        report[name] = latency_stats(seconds, audio_seconds[name])
+    report['peak_rss_mb'] = peak_rss_mb()
+    
+    recognizer.close()
+    return report
+
+
+def run_benchmarks(model_sizes: Sequence[str] = ("tiny", "base"), thread_counts: Sequence[int] = (1, 4),
+                   paths: Optional[Sequence[str]] = None, repeats: int = 3, language: Optional[str] = None,
+                   dtype: Optional[str] = None, backend: str = "whisper") -> Dict[str, Any]:
+    """
+    Benchmark transcription, language detection and the real-time path
+    
+    Every model size / thread count combination runs in a fresh process,
+    so load time and peak RSS are measured in isolation.
+    
+    Args:
+        model_sizes: Whisper model sizes to compare
+        thread_counts: Torch thread counts to compare
+        paths: Audio files to use (default: generated speech-like clips)
+        repeats: Times each clip is run through each entry point
+        language: Language code (optional, auto-detect if not provided)
+        dtype: Weight precision (optional, the backend's default if not provided)
+        backend: Inference engine, "whisper" or "faster-whisper"
+    
+    Returns:
+        JSON-serialisable report with the environment and one entry per configuration
+    """
+    with tempfile.TemporaryDirectory(prefix="maiya-bench-") as temp_dir:
+        if not paths:
+            paths = []
+            for seed, duration in enumerate(DEFAULT_DURATIONS):
+                path = os.path.join(temp_dir, f"synthetic_{int(duration)}s.wav")
+                write_wav(path, synthetic_speech(duration, seed))
+                paths.append(path)
+        
+        results = []
+        context = multiprocessing.get_context("spawn")
+        for model_size in model_sizes:
+            for threads in thread_counts:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    results.append(executor.submit(_bench_config, model_size, threads, paths, repeats,
+                                                   language, dtype, backend).result())
+    
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'torch': torch.__version__,
+            'cpu_count': os.cpu_count(),
+            'cuda': torch.cuda.is_available(),
+        },
+        'audio': [os.path.basename(path) for path in paths],
+        'repeats': repeats,
+        'results': results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maiya performance benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run = commands.add_parser("run", help="Measure RTF, latency, memory and load time")
+    run.add_argument("paths", nargs="*", help="Audio files (default: generated test clips)")
+    run.add_argument("--model-sizes", nargs="+", default=["tiny", "base"])
+    run.add_argument("--threads", nargs="+", type=int, default=[1, 4])
+    run.add_argument("--repeats", type=int, default=3)
+    run.add_argument("--language", default=None)
+    run.add_argument("--dtype", default=None)
+    run.add_argument("--backend", default="whisper", choices=["whisper", "faster-whisper"])
+    run.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    
+    quantization = commands.add_parser("quantization", help="Compare the int8 model against float32")
+    quantization.add_argument("paths", nargs="+", help="Audio files to transcribe")
+    quantization.add_argument("--model-size", default="base")
+    quantization.add_argument("--language", default=None)
+    quantization.add_argument("--max-wer", type=float, default=0.05)
+    args = parser.parse_args(argv)
+    
+    if args.command == "run":
+        report = run_benchmarks(args.model_sizes, args.threads, args.paths, args.repeats,
+                                args.language, args.dtype, args.backend)
+        text = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return 0 if all(result['errors'] == 0 for result in report['results']) else 1
+    
+    if args.command == "quantization":
+        report = compare_quantization(args.model_size, args.paths, args.language, args.max_wer)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0 if report['passed'] else 1
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
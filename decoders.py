@@ -0,0 +1,435 @@
+import io
+import os
+import time
+import atexit
+import threading
+import subprocess
+import numpy as np
+from collections import defaultdict
+from typing import Optional, Dict, Union, Tuple, List
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+from audio_io import (WHISPER_SAMPLE_RATE, WAVE_FORMAT_IEEE_FLOAT, WavStreamReader, parse_wav_bytes,
+                      pcm_to_float32, downmix, resample)
+
+# Leading bytes of common containers
+SIGNATURES = (
+    (b'RIFF', 'wav'),
+    (b'fLaC', 'flac'),
+    (b'OggS', 'ogg'),
+    (b'FORM', 'aiff'),
+    (b'caff', 'caf'),
+    (b'ID3', 'mp3'),
+    (b'\xff\xfb', 'mp3'),
+    (b'\xff\xf3', 'mp3'),
+    (b'\xff\xf2', 'mp3'),
+    (b'\x1a\x45\xdf\xa3', 'webm'),
+)
+
+# Formats libsndfile can read (MP3 needs libsndfile 1.1 or newer; older
+# versions fail fast on the header and fall through to ffmpeg)
+SOUNDFILE_FORMATS = ('wav', 'flac', 'ogg', 'aiff', 'caf', 'mp3')
+
+# Containers whose index can sit at the end of the file (the MP4 'moov'
+# atom), which ffmpeg can't read from a pipe; these are decoded by path
+SEEKABLE_FORMATS = ('mp4', 'm4a', 'mov', '3gp')
+
+
+def sniff_format(header: Union[bytes, memoryview], path: Optional[str] = None) -> str:
+    """
+    Identify an audio container from its first bytes
+    
+    Args:
+        header: At least the first 12 bytes of the file
+        path: File name, used for the extension when the bytes aren't recognised
+    
+    Returns:
+        Short format name ('wav', 'flac', 'ogg', 'mp3', 'mp4', ...) or 'unknown'
+    """
+    header = bytes(header[:16])
+    for signature, name in SIGNATURES:
+        if header.startswith(signature):
+            return name
+    if header[4:8] == b'ftyp':
+        return 'mp4'
+    
+    if path and '.' in path:
+        extension = path.rsplit('.', 1)[-1].lower()
+        if extension.isalnum():
+            return extension
+    return 'unknown'
+
+
+class DecodeStats:
+    """
+    Decode counts and time per input format and decoder
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+    
+    def record(self, audio_format: str, decoder: str, seconds: float):
+        with self._lock:
+            self._counts[audio_format, decoder] += 1
+            self._seconds[audio_format, decoder] += seconds
+    
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Totals so far
+        
+        Returns:
+            {format: {decoder: {'count', 'seconds', 'mean_seconds'}}}
+        """
+        with self._lock:
+            stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+            for (audio_format, decoder), count in self._counts.items():
+                seconds = self._seconds[audio_format, decoder]
+                stats.setdefault(audio_format, {})[decoder] = {
+                    'count': count,
+                    'seconds': seconds,
+                    'mean_seconds': seconds / count,
+                }
+            return stats
+    
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._seconds.clear()
+    
+    def render(self, prefix: str = "maiya") -> str:
+        """
+        Decode counters in Prometheus text format
+        """
+        with self._lock:
+            lines = [f"# TYPE {prefix}_decodes_total counter"]
+            for (audio_format, decoder), count in sorted(self._counts.items()):
+                lines.append(f'{prefix}_decodes_total{{format="{audio_format}",decoder="{decoder}"}} {count}')
+            lines.append(f"# TYPE {prefix}_decode_seconds_sum counter")
+            for (audio_format, decoder), seconds in sorted(self._seconds.items()):
+                lines.append(f'{prefix}_decode_seconds_sum{{format="{audio_format}",decoder="{decoder}"}} '
+                             f'{seconds:.6f}')
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every decode in the process
+decode_stats = DecodeStats()
+
+
+class FFmpegDecoderPool:
+    """
+    Pre-started ffmpeg processes that decode audio fed to them through a pipe
+    
+    For short files most of an ffmpeg decode is process start-up (exec,
+    dynamic linking, codec registration). The pool keeps `size` decoders
+    started and waiting on stdin: a decode takes one, writes the file into
+    it and reads 16 kHz mono PCM back, and a background thread starts a
+    replacement, so start-up overlaps with other requests instead of
+    delaying this one. When no decoder is waiting (size 0, or a burst of
+    requests) the decode starts its own. Each decode runs in its own
+    process, so concurrent decodes use separate cores.
+    """
+    
+    def __init__(self, size: Optional[int] = None, sample_rate: int = WHISPER_SAMPLE_RATE):
+        """
+        Args:
+            size: Decoders kept waiting (defaults to the CPU count, at most 4)
+            sample_rate: Output sample rate in Hz
+        """
+        self.size = size if size is not None else min(4, os.cpu_count() or 1)
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._idle: List[subprocess.Popen] = []
+        self._pid = os.getpid()
+        # Whether a background thread is starting replacement decoders
+        self._refilling = False
+    
+    def _command(self, source: str) -> List[str]:
+        # Same output format as whisper.load_audio
+        command = ["ffmpeg", "-loglevel", "error", "-threads", "0", "-i", source,
+                   "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(self.sample_rate), "-"]
+        if source != "pipe:0":
+            command.insert(1, "-nostdin")
+        return command
+    
+    @staticmethod
+    def _start(command: List[str], **options):
+        # A missing ffmpeg is a decode failure like any other, not an OSError
+        try:
+            return subprocess.Popen(command, **options)
+        except OSError as e:
+            raise RuntimeError(f"Failed to start ffmpeg: {e}") from e
+    
+    def _spawn(self) -> subprocess.Popen:
+        return self._start(self._command("pipe:0"), stdin=subprocess.PIPE,
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    
+    def _check_fork(self):
+        # Caller holds the lock
+        if os.getpid() != self._pid:
+            # Forked child: the waiting decoders and the refill thread belong to the parent
+            self._idle = []
+            self._refilling = False
+            self._pid = os.getpid()
+    
+    def _refill(self):
+        # Caller holds the lock
+        self._check_fork()
+        while len(self._idle) < self.size:
+            self._idle.append(self._spawn())
+    
+    def _refill_in_background(self):
+        # Starts decoders without holding the lock, so requests can take waiting ones meanwhile
+        while True:
+            with self._lock:
+                if len(self._idle) >= self.size:
+                    self._refilling = False
+                    return
+            try:
+                decoder = self._spawn()
+            except RuntimeError:
+                # ffmpeg is missing; decodes report it when they start their own
+                with self._lock:
+                    self._refilling = False
+                return
+            with self._lock:
+                if len(self._idle) < self.size:
+                    self._idle.append(decoder)
+                    decoder = None
+            if decoder is not None:
+                # The pool was shrunk meanwhile
+                self._stop([decoder])
+    
+    def _take(self) -> subprocess.Popen:
+        with self._lock:
+            self._check_fork()
+            decoder = self._idle.pop(0) if self._idle else None
+            refill = not self._refilling and len(self._idle) < self.size
+            if refill:
+                self._refilling = True
+        
+        if refill:
+            threading.Thread(target=self._refill_in_background, name="FFmpegDecoderPool", daemon=True).start()
+        return decoder if decoder is not None else self._spawn()
+    
+    def warm(self):
+        """
+        Start the waiting decoders now rather than on the first decode
+        
+        Raises:
+            RuntimeError: If ffmpeg can't be started
+        """
+        with self._lock:
+            self._refill()
+    
+    def resize(self, size: int):
+        """
+        Change how many decoders are kept waiting
+        """
+        size = max(0, size)
+        with self._lock:
+            self.size = size
+            surplus = self._idle[size:]
+            self._idle = self._idle[:size]
+        self._stop(surplus)
+    
+    def close(self):
+        """
+        Stop the waiting decoders (the pool restarts them if used again)
+        """
+        with self._lock:
+            idle = self._idle if os.getpid() == self._pid else []
+            self._idle = []
+        self._stop(idle)
+    
+    @staticmethod
+    def _stop(decoders: List[subprocess.Popen]):
+        for decoder in decoders:
+            decoder.kill()
+            decoder.communicate()
+    
+    def _to_float32(self, process_result: Tuple[bytes, bytes], returncode: int) -> np.ndarray:
+        out, err = process_result
+        if returncode:
+            raise RuntimeError(f"Failed to load audio: {err.decode(errors='replace')}")
+        return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+    
+    def decode(self, audio_data: Union[bytes, memoryview]) -> np.ndarray:
+        """
+        Decode a complete in-memory file through a waiting decoder
+        
+        Args:
+            audio_data: File contents (not an MP4-family container, see SEEKABLE_FORMATS)
+        
+        Returns:
+            Float32 samples at the pool's sample rate
+        
+        Raises:
+            RuntimeError: If ffmpeg is missing or can't decode the data
+        """
+        decoder = self._take()
+        output = decoder.communicate(bytes(audio_data))
+        return self._to_float32(output, decoder.returncode)
+    
+    def decode_file(self, path: str, audio_format: Optional[str] = None) -> np.ndarray:
+        """
+        Decode a file, through the pipe unless its container needs seeking
+        
+        Raises:
+            RuntimeError: If ffmpeg is missing or can't decode the file
+        """
+        if audio_format is None:
+            with open(path, 'rb') as f:
+                audio_format = sniff_format(f.read(16), path)
+        
+        if audio_format in SEEKABLE_FORMATS:
+            decoder = self._start(self._command(path), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            return self._to_float32(decoder.communicate(), decoder.returncode)
+        
+        with open(path, 'rb') as f:
+            return self.decode(f.read())
+
+
+# Shared by every ffmpeg decode in the process
+ffmpeg_pool = FFmpegDecoderPool()
+atexit.register(ffmpeg_pool.close)
+
+
+def _read_soundfile(source) -> Optional[Tuple[np.ndarray, int]]:
+    if soundfile is None:
+        return None
+    try:
+        data, sample_rate = soundfile.read(source, dtype='float32', always_2d=True)
+    except (RuntimeError, ValueError):
+        # libsndfile can't read this container (or this codec inside it)
+        return None
+    return downmix(data), sample_rate
+
+
+def read_audio(path: str) -> Tuple[np.ndarray, int]:
+    """
+    Decode an audio file to mono float32 at its own sample rate, in-process where possible
+    
+    Uncompressed WAV is read through a memory map, FLAC/OGG/AIFF (and MP3
+    with a recent libsndfile) through soundfile when it is installed, and
+    anything else through ffmpeg_pool.
+    
+    Args:
+        path: Audio file path
+    
+    Returns:
+        (mono float32 samples, sample rate); ffmpeg output is already at 16 kHz
+    
+    Raises:
+        OSError: If the file can't be opened
+        RuntimeError: If ffmpeg is missing or fails to decode it
+    """
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        audio_format = sniff_format(f.read(16), path)
+    
+    decoded = None
+    decoder = None
+    if audio_format == 'wav':
+        reader = WavStreamReader.open(path)
+        if reader is not None:
+            try:
+                with reader:
+                    decoded = (reader.read(0, reader.num_frames), reader.sample_rate)
+                decoder = 'wav'
+            except ValueError:
+                # A sample format we can't convert; let soundfile or ffmpeg try
+                decoded = None
+    
+    if decoded is None and audio_format in SOUNDFILE_FORMATS:
+        decoded = _read_soundfile(path)
+        decoder = 'soundfile'
+    
+    if decoded is None:
+        decoded = (ffmpeg_pool.decode_file(path, audio_format), ffmpeg_pool.sample_rate)
+        decoder = 'ffmpeg'
+    
+    decode_stats.record(audio_format, decoder, time.perf_counter() - started)
+    return decoded
+
+
+def load_audio(path: str) -> np.ndarray:
+    """
+    Decode an audio file to 16 kHz mono float32, see read_audio
+    
+    Args:
+        path: Audio file path
+    
+    Returns:
+        Float32 samples ready for Whisper
+    
+    Raises:
+        OSError: If the file can't be opened
+        RuntimeError: If ffmpeg is missing or fails to decode it
+    """
+    return resample(*read_audio(path))
+
+
+def decode_bytes(audio_data: Union[bytes, memoryview]) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Decode an in-memory audio file without ffmpeg
+    
+    Args:
+        audio_data: Complete file contents
+    
+    Returns:
+        (mono float32 samples, sample rate) at the file's own rate, or None
+        if the data needs ffmpeg
+    """
+    started = time.perf_counter()
+    audio_format = sniff_format(audio_data)
+    
+    decoded = None
+    decoder = None
+    if audio_format == 'wav':
+        wav = parse_wav_bytes(audio_data)
+        if wav is not None and wav['sample_rate'] > 0:
+            try:
+                decoded = (pcm_to_float32(wav['data'], wav['sample_width'], wav['channels'],
+                                          is_float=wav['format'] == WAVE_FORMAT_IEEE_FLOAT),
+                           wav['sample_rate'])
+                decoder = 'wav'
+            except ValueError:
+                pass
+    
+    if decoded is None and audio_format in SOUNDFILE_FORMATS:
+        decoded = _read_soundfile(io.BytesIO(audio_data))
+        decoder = 'soundfile'
+    
+    if decoded is not None:
+        decode_stats.record(audio_format, decoder, time.perf_counter() - started)
+    return decoded
+
+
+def ffmpeg_decode_bytes(audio_data: Union[bytes, memoryview]) -> Optional[np.ndarray]:
+    """
+    Decode an in-memory file through ffmpeg_pool, without a temporary file
+    
+    Args:
+        audio_data: Complete file contents
+    
+    Returns:
+        16 kHz mono float32 samples, or None if the container has to be
+        written to a file first (see SEEKABLE_FORMATS)
+    
+    Raises:
+        RuntimeError: If ffmpeg is missing or can't decode the data
+    """
+    audio_format = sniff_format(audio_data)
+    if audio_format in SEEKABLE_FORMATS:
+        return None
+    
+    started = time.perf_counter()
+    audio = ffmpeg_pool.decode(audio_data)
+    decode_stats.record(audio_format, 'ffmpeg', time.perf_counter() - started)
+    return audio
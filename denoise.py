@@ -0,0 +1,183 @@
+import numpy as np
+from typing import Optional
+
+# Same rate the rest of the pipeline (and Whisper) works at
+SAMPLE_RATE = 16000
+
+
+class StreamingDenoiser:
+    """
+    Streaming noise reduction: DC removal, high-pass and spectral gating
+    
+    Audio is processed in overlapping STFT frames with a square-root Hann
+    window, so it is reconstructed exactly wherever nothing is gated. Each
+    frequency bin is attenuated by how far it sits above a running estimate
+    of the noise spectrum, and bins below the high-pass cutoff are removed.
+    The noise estimate is updated once per chunk from the frames that look
+    like background, so the cost per frame is constant.
+    
+    Output is delayed by n_fft - hop samples internally, but process() and
+    flush() together return exactly as many samples as were fed in, aligned
+    with the input.
+    """
+    
+    def __init__(self, sample_rate: int = SAMPLE_RATE, n_fft: int = 512, highpass_hz: float = 80.0,
+                 threshold_db: float = 6.0, softness_db: float = 6.0, attenuation_db: float = 18.0,
+                 noise_adaptation: float = 0.9, dc_adaptation: float = 0.99):
+        """
+        Args:
+            sample_rate: Sample rate of the audio in Hz
+            n_fft: STFT frame length in samples (hop is half of it)
+            highpass_hz: Frequencies below this are removed (0 disables the high-pass)
+            threshold_db: Level above the noise floor where a bin starts to pass
+            softness_db: Width of the transition from attenuated to passed, in dB
+            attenuation_db: How much bins at the noise floor are turned down
+            noise_adaptation: Smoothing factor for the noise spectrum estimate (0-1)
+            dc_adaptation: Smoothing factor for the DC offset estimate (0-1)
+        """
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop = n_fft // 2
+        self.threshold_db = threshold_db
+        self.softness_db = softness_db
+        self.min_gain = 10.0 ** (-attenuation_db / 20.0)
+        self.noise_adaptation = noise_adaptation
+        self.dc_adaptation = dc_adaptation
+        
+        # Periodic sqrt-Hann: analysis * synthesis windows overlap-add to one at 50% overlap
+        self.window = np.sqrt(0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n_fft) / n_fft)).astype(np.float32)
+        frequencies = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+        # Raised-cosine ramp over one octave below the cutoff to avoid ringing
+        if highpass_hz > 0:
+            ramp = np.clip((frequencies - highpass_hz / 2) / (highpass_hz / 2), 0.0, 1.0)
+            self.highpass = (0.5 - 0.5 * np.cos(np.pi * ramp)).astype(np.float32)
+        else:
+            self.highpass = np.ones(len(frequencies), dtype=np.float32)
+        self.reset()
+    
+    def reset(self):
+        """
+        Forget the noise estimate and any buffered audio
+        """
+        self.noise_power: Optional[np.ndarray] = None
+        self.dc_offset = 0.0
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._input_tail = np.zeros(self.n_fft - self.hop, dtype=np.float32)
+        self._overlap = np.zeros(self.n_fft - self.hop, dtype=np.float32)
+        self._skip = self.n_fft - self.hop
+        self._samples_in = 0
+        self._samples_out = 0
+    
+    def _gains(self, power: np.ndarray) -> np.ndarray:
+        """
+        Per-frame, per-bin gains for a block of power spectra
+        """
+        frame_power = power.sum(axis=1)
+        
+        if self.noise_power is None:
+            # Bootstrap from the quietest frames of the first chunk
+            quiet = frame_power <= np.percentile(frame_power, 20)
+            self.noise_power = power[quiet].mean(axis=0) + 1e-10
+        
+        snr_db = 10.0 * np.log10(power / self.noise_power + 1e-10)
+        gain = np.clip((snr_db - self.threshold_db) / self.softness_db, 0.0, 1.0)
+        gain = self.min_gain + (1.0 - self.min_gain) * gain
+        # Smooth across neighbouring bins to avoid isolated "musical noise" tones
+        gain[:, 1:-1] = 0.25 * gain[:, :-2] + 0.5 * gain[:, 1:-1] + 0.25 * gain[:, 2:]
+        
+        # Update the noise estimate from frames close to the current floor
+        noise_like = frame_power < 2.0 * self.noise_power.sum()
+        if noise_like.any():
+            level = power[noise_like].mean(axis=0)
+            self.noise_power = self.noise_adaptation * self.noise_power + (1.0 - self.noise_adaptation) * level
+        else:
+            # Let the floor creep up so a louder background is picked up eventually
+            self.noise_power = self.noise_power * 1.05
+        
+        return gain * self.highpass
+    
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Clean the next chunk of a stream
+        
+        Args:
+            audio: Mono float32 samples, any length
+        
+        Returns:
+            Cleaned samples (the output trails the input by up to n_fft samples
+            until flush() is called)
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        self._samples_in += len(audio)
+        if len(audio):
+            # DC removal: subtract a slowly tracking estimate of the offset
+            self.dc_offset = (self.dc_adaptation * self.dc_offset
+                              + (1.0 - self.dc_adaptation) * float(audio.mean()))
+            audio = audio - np.float32(self.dc_offset)
+        
+        if len(self._pending):
+            audio = np.concatenate((self._pending, audio))
+        n_hops = len(audio) // self.hop
+        self._pending = audio[n_hops * self.hop:].copy()
+        if n_hops == 0:
+            return np.zeros(0, dtype=np.float32)
+        
+        # Each frame is the previous hop plus the new one
+        buffer = np.concatenate((self._input_tail, audio[:n_hops * self.hop]))
+        self._input_tail = buffer[-(self.n_fft - self.hop):].copy()
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, self.n_fft)[::self.hop]
+        
+        spectrum = np.fft.rfft(frames * self.window, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        cleaned = np.fft.irfft(spectrum * self._gains(power), n=self.n_fft, axis=1).astype(np.float32)
+        cleaned *= self.window
+        
+        # Overlap-add: each output hop is this frame's first half plus the previous frame's second half
+        first_halves = cleaned[:, :self.hop]
+        second_halves = cleaned[:, self.hop:]
+        output = first_halves.reshape(-1)
+        output[:self.hop] += self._overlap
+        output[self.hop:] += second_halves[:-1].reshape(-1)
+        self._overlap = second_halves[-1].copy()
+        
+        if self._skip:
+            skipped = min(self._skip, len(output))
+            output = output[skipped:]
+            self._skip -= skipped
+        self._samples_out += len(output)
+        return output
+    
+    def flush(self) -> np.ndarray:
+        """
+        Return the audio still held back, ending the stream
+        
+        Returns:
+            The remaining cleaned samples
+        """
+        remaining = self._samples_in - self._samples_out
+        if remaining <= 0:
+            return np.zeros(0, dtype=np.float32)
+        
+        # Push enough silence through to drain the pending samples and the overlap
+        dc_offset = self.dc_offset
+        samples_in = self._samples_in
+        output = self.process(np.full(remaining + self.n_fft, dc_offset, dtype=np.float32))
+        self._samples_in = samples_in
+        self._samples_out -= len(output) - remaining
+        return output[:remaining]
+
+
+def denoise(audio: np.ndarray, sample_rate: int = SAMPLE_RATE, **options) -> np.ndarray:
+    """
+    Clean a complete recording with a fresh StreamingDenoiser
+    
+    Args:
+        audio: Mono float32 samples
+        sample_rate: Sample rate of the audio in Hz
+        **options: Passed on to StreamingDenoiser
+    
+    Returns:
+        Cleaned samples, the same length as the input
+    """
+    denoiser = StreamingDenoiser(sample_rate, **options)
+    return np.concatenate((denoiser.process(audio), denoiser.flush()))
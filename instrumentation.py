@@ -0,0 +1,201 @@
+import time
+import threading
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Optional, Dict, Any, Callable, Tuple
+
+import torch
+
+# Stage names recorded by gmtSpeechReco
+#   audio_decode  decoding a file or bytes to float32 samples
+#   resample      sample-rate conversion and downmix
+#   temp_file     writing MP4-family data to a temporary file for ffmpeg
+#   mel           log-Mel spectrogram (time until the first encoder pass)
+#   encode        audio encoder forward passes
+#   decode        text decoder forward passes (the token loop)
+#   postprocess   everything else inside the model call: token filtering,
+#                 temperature fallback bookkeeping, segment building
+#   inference     the whole model call, for backends without encoder/decoder hooks
+
+
+class StageTimer:
+    """
+    Wall-clock time spent in each stage of one request
+    """
+    
+    enabled = True
+    
+    def __init__(self, operation: str):
+        """
+        Args:
+            operation: Name of the entry point being timed (e.g. "transcribe")
+        """
+        self.operation = operation
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.started = time.perf_counter()
+    
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] += seconds
+    
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time the body of a with block as the given stage
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - started
+    
+    @contextmanager
+    def model_stages(self, model):
+        """
+        Split a model call into mel, encode, decode and postprocess
+        
+        Forward hooks on the Whisper encoder and decoder are installed for the
+        duration of the with block. Whisper computes the whole mel before the
+        first encoder pass, so the time until then is counted as mel. Models
+        without an encoder/decoder (e.g. CTranslate2) are timed as a single
+        inference stage. The caller must hold the model's inference lock.
+        """
+        encoder = getattr(model, 'encoder', None)
+        decoder = getattr(model, 'decoder', None)
+        if not isinstance(encoder, torch.nn.Module) or not isinstance(decoder, torch.nn.Module):
+            with self.stage('inference'):
+                yield
+            return
+        
+        # CUDA kernels run asynchronously; wait for them so passes are timed, not just launched
+        device = getattr(model, 'device', None)
+        synchronize = torch.cuda.synchronize if getattr(device, 'type', None) == 'cuda' else None
+        started = time.perf_counter()
+        first_encode: Optional[float] = None
+        passes = {'encode': 0.0, 'decode': 0.0}
+        marks: Dict[str, float] = {}
+        
+        def before(name):
+            def hook(module, args):
+                nonlocal first_encode
+                if synchronize is not None:
+                    synchronize()
+                marks[name] = time.perf_counter()
+                if first_encode is None and name == 'encode':
+                    first_encode = marks[name]
+            return hook
+        
+        def after(name):
+            def hook(module, args, output):
+                if synchronize is not None:
+                    synchronize()
+                passes[name] += time.perf_counter() - marks.pop(name)
+            return hook
+        
+        handles = [
+            encoder.register_forward_pre_hook(before('encode')),
+            encoder.register_forward_hook(after('encode')),
+            decoder.register_forward_pre_hook(before('decode')),
+            decoder.register_forward_hook(after('decode')),
+        ]
+        try:
+            yield
+        finally:
+            for handle in handles:
+                handle.remove()
+            total = time.perf_counter() - started
+            mel = first_encode - started if first_encode is not None else 0.0
+            self.add('mel', mel)
+            self.add('encode', passes['encode'])
+            self.add('decode', passes['decode'])
+            self.add('postprocess', max(0.0, total - mel - passes['encode'] - passes['decode']))
+    
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Seconds per stage plus the request's total so far
+        """
+        return {**self.stages, 'total': time.perf_counter() - self.started}
+    
+    def annotate(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add the stage timings to a result dictionary under 'timings'
+        """
+        result['timings'] = self.as_dict()
+        return result
+
+
+class _NullTimer:
+    """
+    Stand-in for StageTimer when instrumentation is off; every method is a no-op
+    """
+    
+    enabled = False
+    operation = None
+    
+    def add(self, stage: str, seconds: float):
+        pass
+    
+    def stage(self, name: str):
+        return nullcontext()
+    
+    def model_stages(self, model):
+        return nullcontext()
+    
+    def as_dict(self) -> Dict[str, float]:
+        return {}
+    
+    def annotate(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        return result
+
+
+NULL_TIMER = _NullTimer()
+
+
+class CallbackSink:
+    """
+    Metrics sink that hands every request's stage timings to a function
+    """
+    
+    def __init__(self, callback: Callable[[str, Dict[str, float]], None]):
+        """
+        Args:
+            callback: Called as callback(operation, {stage: seconds, ..., 'total': seconds})
+        """
+        self.callback = callback
+    
+    def observe(self, operation: str, stages: Dict[str, float]):
+        self.callback(operation, stages)
+
+
+class PrometheusSink:
+    """
+    Metrics sink that accumulates stage timings for a Prometheus scrape
+    """
+    
+    def __init__(self, prefix: str = "maiya"):
+        """
+        Args:
+            prefix: Metric name prefix
+        """
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._sums: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._counts: Dict[Tuple[str, str], int] = defaultdict(int)
+    
+    def observe(self, operation: str, stages: Dict[str, float]):
+        with self._lock:
+            for stage, seconds in stages.items():
+                self._sums[operation, stage] += seconds
+                self._counts[operation, stage] += 1
+    
+    def render(self) -> str:
+        """
+        Stage timings in Prometheus text format
+        """
+        name = f"{self.prefix}_stage_seconds"
+        with self._lock:
+            lines = [f"# TYPE {name} summary"]
+            for (operation, stage), total in sorted(self._sums.items()):
+                labels = f'operation="{operation}",stage="{stage}"'
+                lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {self._counts[operation, stage]}")
+        return "\n".join(lines) + "\n"
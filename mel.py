@@ -0,0 +1,242 @@
+import functools
+import numpy as np
+import torch
+import torch.nn.functional as F
+import whisper
+from typing import Optional, Union
+
+N_FFT = whisper.audio.N_FFT
+HOP_LENGTH = whisper.audio.HOP_LENGTH
+N_FRAMES = whisper.audio.N_FRAMES
+
+# Whisper clamps Mel power at 1e-10, so frames of digital silence are log10(1e-10)
+SILENCE_LOG_MEL = -10.0
+
+
+def normalise_log_mel(log_mel: torch.Tensor) -> torch.Tensor:
+    """
+    Apply Whisper's dynamic range limit and scaling to raw log10 Mel power
+    """
+    if log_mel.shape[-1] == 0:
+        return log_mel
+    log_mel = torch.maximum(log_mel, log_mel.max() - 8.0)
+    return (log_mel + 4.0) / 4.0
+
+
+class MelFrontend:
+    """
+    Whisper's log-Mel spectrogram with the STFT window and filterbank kept on one device
+    
+    Gives the same features as whisper.log_mel_spectrogram, but frames that
+    only cover zero padding are filled in instead of transformed, so a
+    3-second clip padded to a 30-second window costs 300 frames rather than
+    3000. Stateless apart from the cached tensors, so one instance can be
+    shared between threads; use stream() for incremental computation.
+    """
+    
+    def __init__(self, n_mels: int = 80, device: Union[str, torch.device] = "cpu"):
+        """
+        Args:
+            n_mels: Mel bands (80, or 128 for large-v3)
+            device: Device the spectrogram is computed and returned on
+        """
+        self.n_mels = n_mels
+        self.device = torch.device(device)
+        self.window = torch.hann_window(N_FFT, device=self.device)
+        self.filters = whisper.audio.mel_filters(self.device, n_mels)
+    
+    def to_tensor(self, audio: Union[np.ndarray, torch.Tensor]) -> torch.Tensor:
+        if not torch.is_tensor(audio):
+            audio = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))
+        return audio.to(self.device, torch.float32)
+    
+    def frames_log_mel(self, frames: torch.Tensor) -> torch.Tensor:
+        """
+        Raw log10 Mel power of (count, N_FFT) sample frames, as (n_mels, count)
+        """
+        spectrum = torch.fft.rfft(frames * self.window, dim=-1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        return torch.clamp(self.filters @ power.T, min=1e-10).log10()
+    
+    def silence(self, count: int) -> torch.Tensor:
+        return torch.full((self.n_mels, count), SILENCE_LOG_MEL, device=self.device)
+    
+    def raw_log_mel(self, audio: Union[np.ndarray, torch.Tensor], n_frames: Optional[int] = None) -> torch.Tensor:
+        """
+        Unnormalised log10 Mel power of a complete clip
+        
+        Args:
+            audio: 16 kHz float32 samples
+            n_frames: Zero-pad (or trim) the clip to this many frames first,
+                e.g. N_FRAMES for one 30-second window
+        
+        Returns:
+            (n_mels, frames) tensor on the frontend's device
+        """
+        audio = self.to_tensor(audio)
+        if n_frames is None:
+            length = len(audio)
+            n_frames = length // HOP_LENGTH
+        else:
+            length = n_frames * HOP_LENGTH
+            audio = audio[:length]
+        
+        # Frames from here on only see zero padding, unless the reflection at
+        # the end of the padded clip reaches back into the audio
+        silent_from = -(-(len(audio) + N_FFT // 2) // HOP_LENGTH)
+        if silent_from + N_FFT // HOP_LENGTH >= n_frames:
+            # Little or no padding: transform every frame, centred like torch.stft
+            signal = F.pad(audio, (0, max(length, N_FFT // 2 + 1) - len(audio)))
+            padded = F.pad(signal[None, None], (N_FFT // 2, N_FFT // 2), mode='reflect')[0, 0]
+            return self.frames_log_mel(padded.unfold(0, N_FFT, HOP_LENGTH)[:n_frames])
+        
+        signal = F.pad(audio, (0, (silent_from - 1) * HOP_LENGTH + N_FFT // 2 - len(audio)))
+        padded = torch.cat((signal[1:N_FFT // 2 + 1].flip(0), signal))
+        computed = self.frames_log_mel(padded.unfold(0, N_FFT, HOP_LENGTH)[:silent_from])
+        return torch.cat((computed, self.silence(n_frames - silent_from)), dim=1)
+    
+    def log_mel(self, audio: Union[np.ndarray, torch.Tensor], n_frames: Optional[int] = None) -> torch.Tensor:
+        """
+        Log-Mel spectrogram of a complete clip, like whisper.log_mel_spectrogram
+        
+        Args:
+            audio: 16 kHz float32 samples
+            n_frames: Zero-pad (or trim) the clip to this many frames first,
+                e.g. N_FRAMES for one 30-second window
+        
+        Returns:
+            (n_mels, frames) tensor on the frontend's device
+        """
+        return normalise_log_mel(self.raw_log_mel(audio, n_frames))
+    
+    def stream(self) -> 'MelStream':
+        """
+        Start an incremental spectrogram of a growing buffer
+        """
+        return MelStream(self)
+
+
+class MelStream:
+    """
+    Log-Mel spectrogram of a growing audio buffer, computed only for new frames
+    
+    append() transforms just the frames the new samples complete and caches
+    their raw log-Mel power; mel() adds the one or two frames still waiting
+    for samples (computed against zero padding, not cached) and normalises.
+    The result matches whisper.log_mel_spectrogram of the buffer zero-padded
+    to the requested length, as Whisper's own transcribe pads it.
+    """
+    
+    def __init__(self, frontend: MelFrontend):
+        self.frontend = frontend
+        self.reset()
+    
+    def reset(self):
+        """
+        Forget the buffered audio and cached frames
+        """
+        self._frames = self.frontend.silence(0)
+        # Samples from the start of the next frame's window onwards
+        self._pending = torch.zeros(0, device=self.frontend.device)
+        # Whether the reflection padding of the first frames has been added
+        self._started = False
+        self.num_samples = 0
+    
+    @property
+    def num_frames(self) -> int:
+        """
+        Frames in the buffer, as whisper.log_mel_spectrogram would count them
+        """
+        return self.num_samples // HOP_LENGTH
+    
+    def append(self, audio: Union[np.ndarray, torch.Tensor]):
+        """
+        Add the next 16 kHz samples and transform the frames they complete
+        """
+        audio = self.frontend.to_tensor(audio)
+        self.num_samples += len(audio)
+        pending = torch.cat((self._pending, audio))
+        if not self._started:
+            # The first frames are centred on reflected samples, so wait until there are enough
+            if len(pending) <= N_FFT // 2:
+                self._pending = pending
+                return
+            pending = torch.cat((pending[1:N_FFT // 2 + 1].flip(0), pending))
+            self._started = True
+        
+        count = (len(pending) - N_FFT) // HOP_LENGTH + 1
+        if count > 0:
+            frames = pending.unfold(0, N_FFT, HOP_LENGTH)[:count]
+            self._frames = torch.cat((self._frames, self.frontend.frames_log_mel(frames)), dim=1)
+            pending = pending[count * HOP_LENGTH:]
+        self._pending = pending
+    
+    def trim(self, frames: int):
+        """
+        Drop the first frames (and their samples) from the buffer
+        
+        Frames after the cut are kept rather than recomputed, so the first
+        two differ slightly from a fresh spectrogram, whose first windows
+        are reflection-padded.
+        """
+        frames = min(frames, self.num_frames)
+        if frames <= 0:
+            return
+        if not self._started:
+            self._pending = self._pending[frames * HOP_LENGTH:]
+        else:
+            # Cut frames not transformed yet out of the held-back samples, keeping them frame-aligned
+            uncached = frames - self._frames.shape[1]
+            if uncached > 0:
+                self._pending = self._pending[uncached * HOP_LENGTH:]
+            self._frames = self._frames[:, frames:]
+        self.num_samples -= frames * HOP_LENGTH
+    
+    def raw_log_mel(self, n_frames: Optional[int] = None) -> torch.Tensor:
+        """
+        Unnormalised log10 Mel power of the buffer
+        
+        Args:
+            n_frames: Pad with silence (or trim) to this many frames,
+                e.g. N_FRAMES for one 30-second window
+        """
+        frontend = self.frontend
+        n_frames = self.num_frames if n_frames is None else n_frames
+        if not self._started:
+            # Too short to have been transformed yet
+            return frontend.raw_log_mel(self._pending, n_frames)
+        
+        cached = self._frames[:, :n_frames]
+        missing = n_frames - cached.shape[1]
+        if missing <= 0:
+            return cached
+        
+        # Frames still waiting for samples, against zero padding; any beyond
+        # those only see padding
+        tail_count = min(missing, -(-len(self._pending) // HOP_LENGTH))
+        if tail_count == 0:
+            return torch.cat((cached, frontend.silence(missing)), dim=1)
+        tail = F.pad(self._pending, (0, (tail_count - 1) * HOP_LENGTH + N_FFT - len(self._pending)))
+        tail = frontend.frames_log_mel(tail.unfold(0, N_FFT, HOP_LENGTH)[:tail_count])
+        return torch.cat((cached, tail, frontend.silence(missing - tail_count)), dim=1)
+    
+    def mel(self, n_frames: Optional[int] = None) -> torch.Tensor:
+        """
+        Log-Mel spectrogram of the buffer, normalised like whisper.log_mel_spectrogram
+        
+        Args:
+            n_frames: Pad with silence (or trim) to this many frames,
+                e.g. N_FRAMES for one 30-second window
+        
+        Returns:
+            (n_mels, frames) tensor on the frontend's device
+        """
+        return normalise_log_mel(self.raw_log_mel(n_frames))
+
+
+@functools.lru_cache(maxsize=None)
+def get_frontend(n_mels: int = 80, device: Union[str, torch.device] = "cpu") -> MelFrontend:
+    """
+    Shared MelFrontend for a Mel band count and device
+    """
+    return MelFrontend(n_mels, device)
@@ -0,0 +1,314 @@
+import json
+import shutil
+import time
+import asyncio
+import argparse
+from collections import defaultdict
+from typing import Optional, Dict
+
+try:
+    from aiohttp import web, WSMsgType
+except ImportError:
+    web = None
+
+from speechrecogniation import gmtSpeechReco, pcm_to_float32, WHISPER_SAMPLE_RATE
+from instrumentation import PrometheusSink
+from decoders import decode_stats, ffmpeg_pool
+from vad import UtteranceSegmenter
+
+# Accepted ?sample_rate= and ?channels= values for raw PCM
+MIN_PCM_SAMPLE_RATE = 8000
+MAX_PCM_SAMPLE_RATE = 192000
+MAX_PCM_CHANNELS = 8
+
+
+class ServerMetrics:
+    """
+    Request counters and latencies exposed on /metrics in Prometheus text format
+    """
+    
+    def __init__(self):
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.rejected: Dict[str, int] = defaultdict(int)
+        self.latency_sum: Dict[str, float] = defaultdict(float)
+        self.in_flight = 0
+        self.queued = 0
+        self.websocket_sessions = 0
+        self.started = time.time()
+    
+    def observe(self, endpoint: str, seconds: float, success: bool):
+        self.requests[endpoint] += 1
+        self.latency_sum[endpoint] += seconds
+        if not success:
+            self.errors[endpoint] += 1
+    
+    def render(self) -> str:
+        lines = [
+            "# TYPE maiya_requests_total counter",
+            *[f'maiya_requests_total{{endpoint="{name}"}} {count}' for name, count in self.requests.items()],
+            "# TYPE maiya_request_errors_total counter",
+            *[f'maiya_request_errors_total{{endpoint="{name}"}} {count}' for name, count in self.errors.items()],
+            "# TYPE maiya_requests_rejected_total counter",
+            *[f'maiya_requests_rejected_total{{endpoint="{name}"}} {count}' for name, count in self.rejected.items()],
+            "# TYPE maiya_request_seconds_sum counter",
+            *[f'maiya_request_seconds_sum{{endpoint="{name}"}} {total:.6f}' for name, total in self.latency_sum.items()],
+            "# TYPE maiya_requests_in_flight gauge",
+            f"maiya_requests_in_flight {self.in_flight}",
+            "# TYPE maiya_requests_queued gauge",
+            f"maiya_requests_queued {self.queued}",
+            "# TYPE maiya_websocket_sessions gauge",
+            f"maiya_websocket_sessions {self.websocket_sessions}",
+            "# TYPE maiya_uptime_seconds gauge",
+            f"maiya_uptime_seconds {time.time() - self.started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class TranscriptionServer:
+    """
+    HTTP/WebSocket front end for a single shared gmtSpeechReco
+    
+    Endpoints:
+        POST /transcribe       Body is an audio file (or raw 16-bit PCM with ?sample_rate=...&channels=...)
+        POST /detect-language  Same body, returns the detected language code
+        GET  /stream           WebSocket; send binary 16-bit PCM, receive one JSON result per utterance
+        GET  /health           Liveness and model status
+        GET  /metrics          Prometheus metrics
+    
+    At most max_concurrency requests run at once; up to max_queue more wait
+    and anything beyond that is rejected with 503.
+    """
+    
+    def __init__(self, recognizer: gmtSpeechReco, max_concurrency: int = 4, max_queue: int = 64,
+                 max_body_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            recognizer: Recognizer shared by every request
+            max_concurrency: Requests transcribed at the same time
+            max_queue: Requests allowed to wait for a slot before new ones are rejected
+            max_body_bytes: Largest accepted request body
+        """
+        if web is None:
+            raise ImportError("aiohttp is not installed. Install it with: pip install aiohttp")
+        
+        self.recognizer = recognizer
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_body_bytes = max_body_bytes
+        self.metrics = ServerMetrics()
+        self._slots: Optional[asyncio.Semaphore] = None
+    
+    def create_app(self) -> 'web.Application':
+        """
+        Build the aiohttp application
+        """
+        app = web.Application(client_max_size=self.max_body_bytes)
+        app.add_routes([
+            web.post('/transcribe', self.handle_transcribe),
+            web.post('/detect-language', self.handle_detect_language),
+            web.get('/stream', self.handle_stream),
+            web.get('/health', self.handle_health),
+            web.get('/metrics', self.handle_metrics),
+        ])
+        return app
+    
+    async def _run_limited(self, endpoint: str, coroutine_factory):
+        """
+        Run a request under the concurrency limit, rejecting it if the queue is full
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        
+        if self._slots.locked() and self.metrics.queued >= self.max_queue:
+            self.metrics.rejected[endpoint] += 1
+            raise web.HTTPServiceUnavailable(text=json.dumps({'error': 'Server busy, try again later'}),
+                                             content_type='application/json')
+        
+        self.metrics.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.metrics.queued -= 1
+        
+        self.metrics.in_flight += 1
+        started = time.perf_counter()
+        success = False
+        try:
+            result = await coroutine_factory()
+            success = not isinstance(result, dict) or result.get('success', True)
+            return result
+        finally:
+            self.metrics.in_flight -= 1
+            self.metrics.observe(endpoint, time.perf_counter() - started, success)
+            self._slots.release()
+    
+    @staticmethod
+    def _int_param(request: 'web.Request', name: str, minimum: int, maximum: int) -> Optional[int]:
+        value = request.query.get(name)
+        if value is None:
+            return None
+        try:
+            number = int(value)
+        except ValueError:
+            number = None
+        if number is None or not minimum <= number <= maximum:
+            raise web.HTTPBadRequest(text=json.dumps({'error': f'{name} must be an integer from {minimum} to {maximum}'}),
+                                     content_type='application/json')
+        return number
+    
+    def _sample_rate(self, request: 'web.Request') -> Optional[int]:
+        return self._int_param(request, 'sample_rate', MIN_PCM_SAMPLE_RATE, MAX_PCM_SAMPLE_RATE)
+    
+    def _channels(self, request: 'web.Request') -> int:
+        return self._int_param(request, 'channels', 1, MAX_PCM_CHANNELS) or 1
+    
+    async def handle_transcribe(self, request: 'web.Request') -> 'web.Response':
+        audio_data = await request.read()
+        language = request.query.get('language') or None
+        sample_rate = self._sample_rate(request)
+        channels = self._channels(request)
+        
+        result = await self._run_limited('transcribe', lambda: self.recognizer.atranscribe_audio_data(
+            audio_data, language, sample_rate, channels))
+        return web.json_response(result, status=200 if result['success'] else 422)
+    
+    async def handle_detect_language(self, request: 'web.Request') -> 'web.Response':
+        audio_data = await request.read()
+        sample_rate = self._sample_rate(request)
+        channels = self._channels(request)
+        
+        language = await self._run_limited('detect_language', lambda: self.recognizer.adetect_language_data(
+            audio_data, sample_rate, channels))
+        return web.json_response({
+            'language': language,
+            'name': self.recognizer.supported_languages.get(language, language),
+        }, status=200 if language != 'unknown' else 422)
+    
+    async def handle_stream(self, request: 'web.Request') -> 'web.WebSocketResponse':
+        """
+        Real-time transcription over a WebSocket
+        
+        The client sends binary messages of 16-bit little-endian PCM (16 kHz
+        mono unless ?sample_rate= and ?channels= say otherwise; it is
+        resampled and downmixed on the server) and may send the text message
+        "flush" to force out the current utterance. The server replies with a
+        JSON result per utterance.
+        """
+        language = request.query.get('language') or None
+        sample_rate = self._sample_rate(request) or WHISPER_SAMPLE_RATE
+        channels = self._channels(request)
+        # Building the resampler's filter table is CPU work, keep it off the event loop
+        pipeline = await asyncio.get_running_loop().run_in_executor(
+            None, self.recognizer.make_input_pipeline, sample_rate)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        
+        segmenter = UtteranceSegmenter()
+        frame_size = 2 * channels
+        # Bytes of a frame split across messages, carried into the next one
+        leftover = b''
+        self.metrics.websocket_sessions += 1
+        
+        async def send_result(utterance):
+            result = await self._run_limited('stream', lambda: self.recognizer.atranscribe_array(
+                utterance, language))
+            result['duration'] = len(utterance) / WHISPER_SAMPLE_RATE
+            await ws.send_json(result)
+        
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.BINARY:
+                    data = leftover + message.data if leftover else message.data
+                    split = len(data) - len(data) % frame_size
+                    leftover = data[split:]
+                    audio = pipeline.process(pcm_to_float32(memoryview(data)[:split], channels=channels))
+                    for utterance in segmenter.feed(audio):
+                        await send_result(utterance)
+                elif message.type == WSMsgType.TEXT and message.data.strip() == 'flush':
+                    utterance = segmenter.flush()
+                    if utterance is not None:
+                        await send_result(utterance)
+                elif message.type == WSMsgType.ERROR:
+                    break
+            
+            if not ws.closed:
+                for utterance in segmenter.feed(pipeline.flush()):
+                    await send_result(utterance)
+            utterance = segmenter.flush()
+            if utterance is not None and not ws.closed:
+                await send_result(utterance)
+        
+        except web.HTTPServiceUnavailable:
+            await ws.send_json({'success': False, 'error': 'Server busy, try again later'})
+        
+        finally:
+            self.metrics.websocket_sessions -= 1
+        
+        return ws
+    
+    async def handle_health(self, request: 'web.Request') -> 'web.Response':
+        registry = self.recognizer.registry
+        key = registry.make_key(self.recognizer.model_size, self.recognizer.device,
+                                self.recognizer.dtype, self.recognizer.backend)
+        return web.json_response({
+            'status': 'ok',
+            'model_size': self.recognizer.model_size,
+            'backend': self.recognizer.backend,
+            'device': self.recognizer.device,
+            'model_loaded': key in registry.loaded_models(),
+            'in_flight': self.metrics.in_flight,
+            'queued': self.metrics.queued,
+        })
+    
+    async def handle_metrics(self, request: 'web.Request') -> 'web.Response':
+        text = self.metrics.render()
+        # Per-stage timings, when the recognizer reports to a Prometheus sink
+        sink = self.recognizer.metrics_sink
+        if hasattr(sink, 'render'):
+            text += sink.render()
+        # Decode counts and time per input format
+        text += decode_stats.render()
+        return web.Response(text=text, content_type='text/plain')
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8000, model_size: str = "base",
+               max_concurrency: int = 4, max_queue: int = 64, backend: str = "whisper"):
+    """
+    Load the model and serve until interrupted
+    
+    Args:
+        host: Interface to bind (localhost only by default)
+        port: TCP port
+        model_size: Whisper model size (tiny, base, small, medium, large)
+        max_concurrency: Requests transcribed at the same time
+        max_queue: Requests allowed to wait before new ones are rejected
+        backend: Inference engine, "whisper" or "faster-whisper"
+    """
+    recognizer = gmtSpeechReco(model_size=model_size, backend=backend, preload=True,
+                               max_in_flight=max_concurrency, metrics_sink=PrometheusSink())
+    server = TranscriptionServer(recognizer, max_concurrency=max_concurrency, max_queue=max_queue)
+    # Start the ffmpeg decoders now so the first compressed upload doesn't wait for them
+    if shutil.which("ffmpeg"):
+        ffmpeg_pool.warm()
+    else:
+        print("ffmpeg not found; only WAV, raw PCM and formats soundfile reads will be accepted")
+    
+    print(f"Serving {backend} {model_size} model on http://{host}:{port}")
+    try:
+        web.run_app(server.create_app(), host=host, port=port)
+    finally:
+        recognizer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maiya speech recognition server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model-size", default="base")
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--backend", default="whisper", choices=["whisper", "faster-whisper"])
+    args = parser.parse_args()
+    
+    run_server(args.host, args.port, args.model_size, args.max_concurrency, args.max_queue, args.backend)
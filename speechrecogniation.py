@@ -1,10 +1,348 @@
 import whisper
 import os
+import asyncio
+import functools
 import tempfile
+import threading
+import time
 import pyaudio
 import wave
 import numpy as np
-from typing import Optional, Dict, Any
+import torch
+from collections import OrderedDict, Counter, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, Union, Iterator, AsyncIterator, List, Tuple, Sequence
+
+from audio_io import (WHISPER_SAMPLE_RATE, pcm_to_float32, parse_wav_bytes,
+                      WavStreamReader, StreamingResampler, AudioPipeline, resample, quiet_cut)
+from vad import VoiceActivityGate, UtteranceSegmenter, EnergyVAD
+from transcription_cache import TranscriptionCache
+from backends import WHISPER_BACKEND, default_dtype, validate_backend, load_model
+from instrumentation import StageTimer, NULL_TIMER
+from denoise import StreamingDenoiser
+from decoders import read_audio, decode_bytes, ffmpeg_decode_bytes
+from mel import MelFrontend, get_frontend, N_FRAMES
+
+
+class AudioCapture:
+    """
+    Long-lived microphone capture into a pre-allocated float32 ring buffer
+    
+    The PortAudio stream stays open and its callback converts each block
+    straight into the ring buffer, so capturing needs no per-chunk Python
+    objects, joins or temporary files. Readers get float32 views into the
+    buffer; a view stays valid until the writer laps it (buffer_seconds later).
+    """
+    
+    def __init__(self, sample_rate: int = WHISPER_SAMPLE_RATE, channels: int = 1,
+                 buffer_seconds: float = 60.0, frames_per_buffer: int = 1024):
+        """
+        Args:
+            sample_rate: Audio sample rate
+            channels: Number of audio channels captured (downmixed to mono)
+            buffer_seconds: Seconds of audio kept in the ring buffer
+            frames_per_buffer: Frames PortAudio delivers per callback
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_per_buffer = frames_per_buffer
+        self.capacity = max(int(sample_rate * buffer_seconds), frames_per_buffer * 2)
+        self._ring = np.zeros(self.capacity, dtype=np.float32)
+        self._mix = np.zeros(frames_per_buffer, dtype=np.float32) if channels > 1 else None
+        self._written = 0
+        self._condition = threading.Condition()
+        self._pyaudio = None
+        self._stream = None
+        self.dropped_frames = 0
+    
+    def start(self):
+        """
+        Open the input device and start filling the ring buffer
+        """
+        if self._stream is not None:
+            return
+        
+        self._pyaudio = pyaudio.PyAudio()
+        try:
+            self._stream = self._pyaudio.open(format=pyaudio.paInt16,
+                                              channels=self.channels,
+                                              rate=self.sample_rate,
+                                              input=True,
+                                              frames_per_buffer=self.frames_per_buffer,
+                                              stream_callback=self._callback)
+            self._stream.start_stream()
+        except Exception:
+            self._pyaudio.terminate()
+            self._pyaudio = None
+            self._stream = None
+            raise
+    
+    def _callback(self, in_data, frame_count, time_info, status):
+        samples = np.frombuffer(in_data, dtype='<i2')
+        if self.channels > 1:
+            frames = samples.reshape(-1, self.channels)
+            if len(self._mix) < len(frames):
+                self._mix = np.zeros(len(frames), dtype=np.float32)
+            samples = np.mean(frames, axis=1, dtype=np.float32, out=self._mix[:len(frames)])
+        
+        # Keep only the newest capacity frames if a callback is ever larger than the ring
+        samples = samples[-self.capacity:]
+        count = len(samples)
+        start = self._written % self.capacity
+        first = min(count, self.capacity - start)
+        scale = np.float32(1.0 / 32768.0)
+        np.multiply(samples[:first], scale, out=self._ring[start:start + first], casting='unsafe')
+        if first < count:
+            np.multiply(samples[first:], scale, out=self._ring[:count - first], casting='unsafe')
+        
+        with self._condition:
+            self._written += count
+            self._condition.notify_all()
+        
+        return (None, pyaudio.paContinue)
+    
+    @property
+    def running(self) -> bool:
+        return self._stream is not None and self._stream.is_active()
+    
+    @property
+    def position(self) -> int:
+        """
+        Total number of frames captured so far
+        """
+        return self._written
+    
+    def wait_for(self, position: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until at least position frames have been captured
+        
+        Returns:
+            True if the position was reached, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._written >= position, timeout)
+    
+    def read(self, start: int, count: int) -> np.ndarray:
+        """
+        Get captured audio by absolute frame position
+        
+        Returns a view into the ring buffer when the range doesn't wrap
+        around its end (a copy otherwise).
+        
+        Args:
+            start: Absolute position of the first frame
+            count: Number of frames
+        
+        Returns:
+            Mono float32 samples
+        
+        Raises:
+            ValueError: If the range has not been captured yet or was already overwritten
+        """
+        if start + count > self._written or start < self._written - self.capacity:
+            raise ValueError("Requested audio is not in the capture buffer")
+        
+        index = start % self.capacity
+        if index + count <= self.capacity:
+            return self._ring[index:index + count]
+        return np.concatenate((self._ring[index:], self._ring[:index + count - self.capacity]))
+    
+    def iter_blocks(self, block_frames: int,
+                    stop_event: Optional[threading.Event] = None) -> Iterator[np.ndarray]:
+        """
+        Follow the stream, yielding consecutive blocks as they are captured
+        
+        Starts at the current position. If the consumer falls so far behind
+        that unread audio is about to be overwritten, it skips ahead to the
+        newest block and counts the skipped frames in dropped_frames.
+        
+        Args:
+            block_frames: Frames per block
+            stop_event: Stops the iteration when set (optional)
+        
+        Yields:
+            Mono float32 blocks
+        
+        Raises:
+            IOError: If the input stream stops while being read
+        """
+        block_frames = min(block_frames, self.capacity // 2)
+        read_pos = self.position
+        
+        while stop_event is None or not stop_event.is_set():
+            if not self.wait_for(read_pos + block_frames, timeout=0.5):
+                if not self.running:
+                    raise IOError("Audio input stream stopped")
+                continue
+            
+            lag = self._written - read_pos
+            if lag > self.capacity - block_frames:
+                skip_to = self._written - block_frames
+                self.dropped_frames += skip_to - read_pos
+                read_pos = skip_to
+            
+            yield self.read(read_pos, block_frames)
+            read_pos += block_frames
+    
+    def close(self):
+        """
+        Stop the stream and release the audio device
+        """
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded speech recognition models
+    
+    Models are keyed by (model_size, device, dtype, backend), loaded on first
+    use and shared by every gmtSpeechReco instance in the process. At most
+    max_models are kept resident; the least recently used one is evicted
+    beyond that.
+    """
+    
+    def __init__(self, max_models: int = 2):
+        """
+        Args:
+            max_models: Maximum number of models kept in memory at once
+        """
+        self.max_models = max_models
+        self._models: "OrderedDict[Tuple[str, str, str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading_locks: Dict[Tuple[str, str, str, str], threading.Lock] = {}
+        self._inference_locks: Dict[Tuple[str, str, str, str], threading.Lock] = {}
+    
+    @staticmethod
+    def resolve_device(device: Optional[str] = None) -> str:
+        """
+        Pick the device a model should live on (CUDA when available)
+        """
+        if device:
+            return device
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    
+    def make_key(self, model_size: str, device: Optional[str] = None, dtype: Optional[str] = None,
+                 backend: str = WHISPER_BACKEND) -> Tuple[str, str, str, str]:
+        """
+        Build the registry key for a model, validating the backend and dtype
+        """
+        device = self.resolve_device(device)
+        dtype = dtype or default_dtype(backend)
+        validate_backend(backend, device, dtype)
+        return (model_size, device, dtype, backend)
+    
+    def get(self, model_size: str, device: Optional[str] = None, dtype: Optional[str] = None,
+            backend: str = WHISPER_BACKEND):
+        """
+        Return a shared model, loading it on first use
+        
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large)
+            device: Torch device (optional, CUDA if available else CPU)
+            dtype: Weight precision (optional, the backend's default if not provided)
+            backend: Inference backend ("whisper" or "faster-whisper")
+        
+        Returns:
+            Loaded model
+        """
+        key = self.make_key(model_size, device, dtype, backend)
+        
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            loading_lock = self._loading_locks.setdefault(key, threading.Lock())
+        
+        # Load outside the registry lock so other models stay available,
+        # but make sure concurrent callers only load the same weights once
+        with loading_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+            
+            model_size, device, dtype, backend = key
+            model = load_model(backend, model_size, device, dtype)
+            
+            with self._lock:
+                self._models[key] = model
+                self._loading_locks.pop(key, None)
+                self._evict()
+            return model
+    
+    def preload(self, model_size: str, device: Optional[str] = None, dtype: Optional[str] = None,
+                backend: str = WHISPER_BACKEND):
+        """
+        Load a model ahead of time so the first request doesn't pay for it
+        """
+        return self.get(model_size, device, dtype, backend)
+    
+    def unload(self, model_size: Optional[str] = None, device: Optional[str] = None,
+               dtype: Optional[str] = None, backend: Optional[str] = None) -> int:
+        """
+        Drop models from the registry
+        
+        Any argument left as None matches every value, so unload() with no
+        arguments clears the registry.
+        
+        Returns:
+            Number of models unloaded
+        """
+        with self._lock:
+            keys = [key for key in self._models
+                    if (model_size is None or key[0] == model_size)
+                    and (device is None or key[1] == device)
+                    and (dtype is None or key[2] == dtype)
+                    and (backend is None or key[3] == backend)]
+            for key in keys:
+                del self._models[key]
+        
+        if keys and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        return len(keys)
+    
+    def _evict(self):
+        # Caller holds self._lock
+        while len(self._models) > max(self.max_models, 1):
+            self._models.popitem(last=False)
+    
+    def inference_lock(self, model_size: str, device: Optional[str] = None, dtype: Optional[str] = None,
+                       backend: str = WHISPER_BACKEND) -> threading.Lock:
+        """
+        Lock serialising inference on a shared model
+        
+        Whisper's decoder installs kv-cache hooks on the model for each call,
+        so two threads must never run the same model at once.
+        """
+        key = self.make_key(model_size, device, dtype, backend)
+        with self._lock:
+            return self._inference_locks.setdefault(key, threading.Lock())
+    
+    def loaded_models(self) -> List[Tuple[str, str, str, str]]:
+        """
+        Keys of the resident models, least recently used first
+        """
+        with self._lock:
+            return list(self._models.keys())
+
+
+# Shared by every gmtSpeechReco instance unless one is passed explicitly
+model_registry = ModelRegistry()
+
 
 class gmtSpeechReco:
     """
@@ -12,14 +350,80 @@ class gmtSpeechReco:
     Supports Hindi, English, and other languages
     """
     
-    def __init__(self, model_size: str = "base"):
+    def __init__(self, model_size: str = "base", device: Optional[str] = None,
+                 dtype: Optional[str] = None, registry: Optional[ModelRegistry] = None,
+                 preload: bool = False, cache: Optional[TranscriptionCache] = None,
+                 max_in_flight: int = 8, async_workers: int = 2, backend: str = WHISPER_BACKEND,
+                 quantize: Optional[str] = None, instrument: bool = False, metrics_sink=None,
+                 noise_reduction: bool = False, capture_sample_rate: int = WHISPER_SAMPLE_RATE,
+                 capture_channels: int = 1):
         """
         Initialize the speech recognition model
         
+        The model is fetched from a process-wide registry, so instances with
+        the same settings share one copy of the weights. It is loaded on
+        first use unless preload is set.
+        
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
+            device: Torch device (optional, CUDA if available else CPU)
+            dtype: Weight precision (optional, float32 for "whisper" and int8 for
+                "faster-whisper"; float16 needs CUDA, int8 on "whisper" the CPU)
+            registry: Model registry to use (defaults to the shared model_registry)
+            preload: Load the model now instead of on first use
+            cache: Result cache for repeated audio (optional, no caching if not provided)
+            max_in_flight: Async requests running at once; further callers wait
+            async_workers: Threads running async requests (decoding overlaps inference)
+            backend: Inference engine, "whisper" (PyTorch) or "faster-whisper"
+                (CTranslate2, much faster on CPU with int8)
+            quantize: "int8" to run the linear layers with dynamically quantized
+                weights on the CPU (the same as dtype="int8"; the quantized
+                weights are cached on disk after the first load)
+            instrument: Record per-stage durations in each result under 'timings'
+            metrics_sink: Object with observe(operation, stages) that receives
+                every request's stage durations, e.g. instrumentation.PrometheusSink
+                (turns instrumentation on)
+            noise_reduction: Clean microphone audio with a StreamingDenoiser
+                (DC removal, high-pass, spectral gating) before VAD and Whisper
+            capture_sample_rate: Rate the microphone is opened at in real-time
+                modes (e.g. the device's native 44100 or 48000); audio is
+                resampled to 16 kHz in-process
+            capture_channels: Channels the microphone is opened with (downmixed to mono)
         """
-        self.model = whisper.load_model(model_size)
+        if quantize is not None:
+            if quantize != "int8":
+                raise ValueError(f"Unsupported quantization '{quantize}', expected 'int8'")
+            if dtype not in (None, quantize):
+                raise ValueError(f"quantize='{quantize}' conflicts with dtype='{dtype}'")
+            dtype = quantize
+            if backend == WHISPER_BACKEND:
+                # Dynamic quantization only has CPU kernels
+                device = device or "cpu"
+        
+        self.model_size = model_size
+        self.registry = registry if registry is not None else model_registry
+        self.device = self.registry.resolve_device(device)
+        self.backend = backend
+        self.dtype = dtype or default_dtype(backend)
+        self.cache = cache
+        self._capture: Optional[AudioCapture] = None
+        self.max_in_flight = max_in_flight
+        self.async_workers = async_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # One max_in_flight semaphore per event loop (a semaphore is bound to the loop that first waits on it)
+        self._async_limits: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._async_limits_lock = threading.Lock()
+        self.batcher: Optional[MicroBatcher] = None
+        self.metrics_sink = metrics_sink
+        self.instrument = instrument or metrics_sink is not None
+        self._timing_state = threading.local()
+        self.noise_reduction = noise_reduction
+        self.capture_sample_rate = capture_sample_rate
+        self.capture_channels = capture_channels
+        # Validate the settings up front rather than on the first request
+        self.registry.make_key(model_size, self.device, self.dtype, backend)
+        if preload:
+            self.registry.preload(model_size, self.device, self.dtype, backend)
         self.supported_languages = {
             'en': 'English',
             'hi': 'Hindi', 
@@ -44,6 +448,78 @@ class gmtSpeechReco:
             'ur': 'Urdu'
         }
     
+    # Seconds of microphone audio kept in the capture ring buffer
+    CAPTURE_BUFFER_SECONDS = 60.0
+    
+    # WAV files at least this long (seconds) are transcribed window by window
+    # from a memory map instead of being loaded into RAM in one piece
+    STREAMING_MIN_DURATION = 600.0
+    
+    # Whisper's transcribe defaults: a window is silent if the model thinks
+    # so and the decoded text is unlikely
+    NO_SPEECH_THRESHOLD = 0.6
+    LOGPROB_THRESHOLD = -1.0
+    
+    @property
+    def model(self):
+        """
+        Whisper model for this instance, loaded lazily through the registry
+        """
+        return self.registry.get(self.model_size, self.device, self.dtype, self.backend)
+    
+    @property
+    def model_lock(self) -> threading.Lock:
+        """
+        Lock held while this instance's (shared) model is running
+        """
+        return self.registry.inference_lock(self.model_size, self.device, self.dtype, self.backend)
+    
+    @property
+    def mel_frontend(self) -> MelFrontend:
+        """
+        Log-Mel front end for this model's Mel bands and device (whisper backend only)
+        """
+        model = self.model
+        return get_frontend(model.dims.n_mels, model.device)
+    
+    @property
+    def model_id(self) -> str:
+        """
+        Identifies the weights used for transcription (part of cache keys)
+        """
+        return f"{self.backend}:{self.model_size}:{self.dtype}"
+    
+    @contextmanager
+    def _timing(self, operation: str):
+        """
+        Timing scope for one request
+        
+        Yields NULL_TIMER when instrumentation is off. Nested scopes on the
+        same thread share the outermost timer, which reports to the metrics
+        sink when it closes.
+        """
+        if not self.instrument:
+            yield NULL_TIMER
+            return
+        
+        timer = getattr(self._timing_state, 'timer', None)
+        if timer is not None:
+            yield timer
+            return
+        
+        timer = StageTimer(operation)
+        self._timing_state.timer = timer
+        try:
+            yield timer
+        finally:
+            self._timing_state.timer = None
+            if self.metrics_sink is not None:
+                try:
+                    self.metrics_sink.observe(operation, timer.as_dict())
+                except Exception:
+                    # A broken sink must not fail the request
+                    pass
+    
     def transcribe_audio(self, audio_file_path: str, language: Optional[str] = None) -> Dict[str, Any]:
         """
         Transcribe audio file to text
@@ -51,59 +527,478 @@ class gmtSpeechReco:
         Args:
             audio_file_path: Path to the audio file
             language: Language code (optional, auto-detect if not provided)
+        
+        Returns:
+            Dictionary containing transcription results
+        """
+        with self._timing('transcribe_audio') as timer:
+            reader = WavStreamReader.open(audio_file_path)
+            if reader is not None:
+                with reader:
+                    if reader.duration >= self.STREAMING_MIN_DURATION:
+                        return timer.annotate(self._transcribe_stream(reader, language, timer=timer))
             
+            return timer.annotate(self._transcribe(audio_file_path, language))
+    
+    def transcribe_stream(self, audio_file_path: str, language: Optional[str] = None,
+                          window_duration: float = 30.0) -> Dict[str, Any]:
+        """
+        Transcribe a large WAV file in bounded memory
+        
+        The file is memory-mapped and transcribed one window at a time
+        (resampled to 16 kHz if needed); each window is prompted with the
+        previous window's text to keep some context across boundaries.
+        
+        Args:
+            audio_file_path: Path to an uncompressed WAV file
+            language: Language code (optional, detected from the first window if not provided)
+            window_duration: Window length in seconds
+        
         Returns:
             Dictionary containing transcription results
         """
         try:
-            # Transcribe the audio
-            if language and language in self.supported_languages:
-                result = self.model.transcribe(audio_file_path, language=language)
+            reader = WavStreamReader(audio_file_path)
+        except Exception as e:
+            return self._error_result(e)
+        
+        with reader, self._timing('transcribe_stream') as timer:
+            return timer.annotate(self._transcribe_stream(reader, language, window_duration, timer))
+    
+    def _transcribe_stream(self, reader: WavStreamReader, language: Optional[str] = None,
+                           window_duration: float = 30.0, timer=NULL_TIMER) -> Dict[str, Any]:
+        try:
+            if language and language not in self.supported_languages:
+                # Ignored and auto-detected, as _transcribe does
+                language = None
+            if not language:
+                # Fix the language up front so every window uses the same one,
+                # even if it's outside supported_languages
+                language = self.detect_language(self._read_first_window(reader, timer))
+            language = language if language != 'unknown' else None
+            
+            segments = []
+            prompt = None
+            for start, window in reader.iter_windows(window_duration):
+                if reader.sample_rate != WHISPER_SAMPLE_RATE:
+                    with timer.stage('resample'):
+                        window = resample(window, reader.sample_rate)
+                result = self._transcribe(window, language, restrict_language=False,
+                                          initial_prompt=prompt)
+                if not result['success']:
+                    return result
+                
+                offset = start / reader.sample_rate
+                seek = int(offset * WHISPER_SAMPLE_RATE) // whisper.audio.HOP_LENGTH
+                for segment in result['segments']:
+                    segment = dict(segment)
+                    segment['id'] = len(segments)
+                    segment['start'] += offset
+                    segment['end'] += offset
+                    segment['seek'] = segment.get('seek', 0) + seek
+                    segments.append(segment)
+                
+                language = language or result['language']
+                prompt = result['text'] or None
+        
+        except Exception as e:
+            return self._error_result(e)
+        
+        return {
+            'success': True,
+            'text': ' '.join(segment['text'].strip() for segment in segments if segment['text'].strip()),
+            'language': language or 'unknown',
+            'segments': segments,
+            'error': None
+        }
+    
+    def transcribe_array(self, audio: np.ndarray, language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Transcribe audio that is already decoded in memory
+        
+        Args:
+            audio: Mono float32 samples at 16 kHz in [-1.0, 1.0]
+            language: Language code (optional, auto-detect if not provided)
+        
+        Returns:
+            Dictionary containing transcription results
+        """
+        return self._transcribe(np.ascontiguousarray(audio, dtype=np.float32), language)
+    
+    def _transcribe(self, audio: Union[str, np.ndarray], language: Optional[str] = None,
+                    restrict_language: bool = True, **decode_options) -> Dict[str, Any]:
+        """
+        Run Whisper on a file path or a float32 array and build the result dictionary
+        
+        Unless restrict_language is False, a language outside
+        supported_languages is ignored and auto-detected instead. Extra
+        keyword arguments are passed on to model.transcribe.
+        """
+        with self._timing('transcribe') as timer:
+            try:
+                options = dict(decode_options)
+                if language and (language in self.supported_languages or not restrict_language):
+                    options['language'] = language
+                
+                # Decode in-process where possible (ffmpeg only for formats
+                # we can't read ourselves); the cache key is a hash of the samples
+                if isinstance(audio, str):
+                    audio = self._load_file(audio, timer)
+                
+                cache_key = None
+                if self.cache is not None:
+                    cache_key = self.cache.make_key(audio, self.model_id, options.get('language'), options)
+                    cached = self.cache.get(cache_key)
+                    if cached is not None:
+                        return timer.annotate(cached)
+                
+                # Transcribe the audio
+                with self.model_lock, timer.model_stages(self.model):
+                    result = self.model.transcribe(audio, **options)
+                
+                output = {
+                    'success': True,
+                    'text': result['text'].strip(),
+                    'language': result.get('language', 'unknown'),
+                    'segments': result.get('segments', []),
+                    'error': None
+                }
+                
+                if cache_key is not None:
+                    self.cache.put(cache_key, output)
+                return timer.annotate(output)
+            
+            except Exception as e:
+                return timer.annotate(self._error_result(e))
+    
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        """
+        Build the result dictionary returned when transcription fails
+        """
+        return {
+            'success': False,
+            'text': '',
+            'language': None,
+            'segments': [],
+            'error': str(error)
+        }
+    
+    def transcribe_audio_data(self, audio_data: bytes, language: Optional[str] = None,
+                              sample_rate: Optional[int] = None, channels: int = 1) -> Dict[str, Any]:
+        """
+        Transcribe audio data (bytes) to text
+        
+        WAV data, raw 16-bit PCM and (with soundfile installed) FLAC/OGG are
+        decoded (and resampled to 16 kHz mono if needed) in memory and passed
+        straight to Whisper. Other containers are piped to a waiting ffmpeg
+        decoder, except MP4/M4A, which ffmpeg reads from a temporary file.
+        
+        Args:
+            audio_data: Raw audio data in bytes (a complete audio file, or
+                headerless 16-bit PCM when sample_rate is given)
+            language: Language code (optional, auto-detect if not provided)
+            sample_rate: Sample rate of headerless PCM data (e.g. 8000, 44100, 48000)
+            channels: Interleaved channels in headerless PCM data (downmixed to mono)
+        
+        Returns:
+            Dictionary containing transcription results
+        """
+        with self._timing('transcribe_audio_data') as timer:
+            try:
+                audio = self._decode_audio_data(audio_data, sample_rate, channels, timer)
+                if audio is None:
+                    with timer.stage('audio_decode'):
+                        audio = ffmpeg_decode_bytes(audio_data)
+            except (ValueError, RuntimeError) as e:
+                return timer.annotate(self._error_result(e))
+            
+            if audio is not None:
+                # The batcher decodes one 30-second window per request; longer audio goes through model.transcribe
+                if self.batcher is not None and len(audio) <= whisper.audio.N_SAMPLES:
+                    return timer.annotate(self.batcher.submit(audio, language).result())
+                return timer.annotate(self.transcribe_array(audio, language))
+            
+            # MP4-family containers need a seekable file for ffmpeg
+            with timer.stage('temp_file'):
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+                    temp_file.write(audio_data)
+                    temp_file_path = temp_file.name
+            
+            try:
+                # Transcribe the temporary file
+                result = self.transcribe_audio(temp_file_path, language)
+                return timer.annotate(result)
+            
+            finally:
+                # Clean up temporary file
+                with timer.stage('temp_file'):
+                    if os.path.exists(temp_file_path):
+                        os.unlink(temp_file_path)
+    
+    @staticmethod
+    def _decode_audio_data(audio_data: bytes, sample_rate: Optional[int] = None, channels: int = 1,
+                           timer=NULL_TIMER) -> Optional[np.ndarray]:
+        """
+        Decode audio file or raw PCM bytes in memory and convert them to 16 kHz mono
+        
+        Returns:
+            Float32 samples, or None if the data has to go through ffmpeg
+        
+        Raises:
+            ValueError: If the raw PCM sample rate or channel count is invalid
+        """
+        with timer.stage('audio_decode'):
+            if sample_rate is not None and parse_wav_bytes(audio_data) is None:
+                if sample_rate <= 0 or channels < 1:
+                    raise ValueError(f"Invalid raw PCM format: {sample_rate} Hz, {channels} channel(s)")
+                audio = pcm_to_float32(audio_data, channels=channels)
             else:
-                result = self.model.transcribe(audio_file_path)
+                decoded = decode_bytes(audio_data)
+                if decoded is None:
+                    return None
+                audio, sample_rate = decoded
+        
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            with timer.stage('resample'):
+                audio = resample(audio, sample_rate)
+        return audio
+    
+    @staticmethod
+    def _load_file(path: str, timer=NULL_TIMER) -> np.ndarray:
+        """
+        Decode an audio file to 16 kHz float32, timing decoding and resampling as separate stages
+        """
+        with timer.stage('audio_decode'):
+            audio, sample_rate = read_audio(path)
+        
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            with timer.stage('resample'):
+                audio = resample(audio, sample_rate)
+        return audio
+    
+    def _load_input(self, item: Union[str, np.ndarray], timer=NULL_TIMER) -> np.ndarray:
+        """
+        Decode a file path, or normalise an in-memory array, to 16 kHz float32
+        """
+        if isinstance(item, np.ndarray):
+            return np.ascontiguousarray(item, dtype=np.float32)
+        return self._load_file(item, timer)
+    
+    def transcribe_batch(self, paths_or_arrays: Sequence[Union[str, np.ndarray]],
+                         language: Optional[str] = None, batch_size: int = 8,
+                         num_workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        Transcribe many files or arrays, batching their 30-second windows through the model
+        
+        Inputs are decoded in parallel, cut into independent windows of up to
+        30 seconds (each cut moved back to the quietest 10 ms in its last two
+        seconds, like WavStreamReader.iter_windows) and decoded in padded
+        batches, so each encoder forward pass covers up to batch_size windows.
+        Windows do not condition on each other's text, which trades a little
+        accuracy at window boundaries for throughput. Each window becomes one
+        segment, so timestamps are window-granular.
+        
+        Args:
+            paths_or_arrays: Audio file paths and/or 16 kHz mono float32 arrays
+            language: Language code (optional, auto-detect per window if not provided)
+            batch_size: Number of 30-second windows per forward pass
+            num_workers: Threads used to decode the input audio
+        
+        Returns:
+            One dictionary per input, in input order, shaped like transcribe_audio's result
+        """
+        items = list(paths_or_arrays)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        if not items:
+            return []
+        
+        # Decode all inputs in parallel (native decoders release the GIL, ffmpeg runs in its own process)
+        audios: List[Optional[np.ndarray]] = [None] * len(items)
+        with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+            futures = [executor.submit(self._load_input, item) for item in items]
+            for index, future in enumerate(futures):
+                try:
+                    audios[index] = future.result()
+                except Exception as e:
+                    results[index] = self._error_result(e)
+        
+        if self.backend != WHISPER_BACKEND:
+            # CTranslate2 batches inside its own transcribe; there is no
+            # whisper.decode equivalent, so transcribe each input in turn
+            return [result if result is not None else self._transcribe(audio, language)
+                    for result, audio in zip(results, audios)]
+        
+        # Cut every input into windows of up to 30 seconds, ending in quiet frames:
+        # (item index, window start, window end) in samples
+        sample_rate = whisper.audio.SAMPLE_RATE
+        window_samples = whisper.audio.N_SAMPLES
+        windows = []
+        for index, audio in enumerate(audios):
+            if audio is None:
+                continue
+            start = 0
+            while True:
+                end = min(start + window_samples, len(audio))
+                if end < len(audio):
+                    end = start + quiet_cut(audio[start:end], 2 * sample_rate, sample_rate // 100)
+                windows.append((index, start, end))
+                start = end
+                if start >= len(audio):
+                    break
+        
+        model = self.model
+        options = whisper.DecodingOptions(
+            language=language if language in self.supported_languages else None,
+            without_timestamps=True,
+            fp16=self.dtype == "float16",
+        )
+        decoded: Dict[int, List[Tuple[int, int, Any]]] = {}
+        
+        for batch_start in range(0, len(windows), max(1, batch_size)):
+            batch = windows[batch_start:batch_start + max(1, batch_size)]
+            try:
+                # The log-mel is normalised per window, so compute them separately and stack
+                frontend = self.mel_frontend
+                mel = torch.stack([
+                    frontend.log_mel(audios[index][start:end], N_FRAMES)
+                    for index, start, end in batch
+                ])
+                with self.model_lock:
+                    batch_results = whisper.decode(model, mel, options)
+            
+            except Exception as e:
+                for index, _, _ in batch:
+                    results[index] = self._error_result(e)
+                continue
+            
+            for (index, start, end), window_result in zip(batch, batch_results):
+                decoded.setdefault(index, []).append((start, end, window_result))
+        
+        for index, audio in enumerate(audios):
+            if results[index] is not None or audio is None:
+                continue
+            
+            segments = []
+            for start, end, window_result in sorted(decoded.get(index, []), key=lambda w: w[0]):
+                text = window_result.text.strip()
+                if not text:
+                    continue
+                # Drop hallucinated text in silent windows, as model.transcribe does
+                if (window_result.no_speech_prob > self.NO_SPEECH_THRESHOLD
+                        and window_result.avg_logprob < self.LOGPROB_THRESHOLD):
+                    continue
+                segments.append({
+                    'id': len(segments),
+                    'seek': start // whisper.audio.HOP_LENGTH,
+                    'start': start / sample_rate,
+                    'end': end / sample_rate,
+                    'text': text,
+                    'tokens': window_result.tokens,
+                    'temperature': window_result.temperature,
+                    'avg_logprob': window_result.avg_logprob,
+                    'compression_ratio': window_result.compression_ratio,
+                    'no_speech_prob': window_result.no_speech_prob,
+                })
             
-            return {
+            languages = Counter(window_result.language for _, _, window_result in decoded.get(index, []))
+            results[index] = {
                 'success': True,
-                'text': result['text'].strip(),
-                'language': result.get('language', 'unknown'),
-                'segments': result.get('segments', []),
+                'text': ' '.join(segment['text'] for segment in segments),
+                'language': languages.most_common(1)[0][0] if languages else 'unknown',
+                'segments': segments,
                 'error': None
             }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'text': '',
-                'language': None,
-                'segments': [],
-                'error': str(e)
-            }
+        
+        return results
     
-    def transcribe_audio_data(self, audio_data: bytes, language: Optional[str] = None) -> Dict[str, Any]:
+    @staticmethod
+    def _plan_regions(audio: np.ndarray, max_region_duration: float,
+                      vad_detector=None) -> List[Tuple[int, int]]:
         """
-        Transcribe audio data (bytes) to text
+        Find speech regions with VAD and pack them into pieces of at most max_region_duration
+        """
+        gate = VoiceActivityGate(vad_detector if vad_detector is not None else EnergyVAD())
+        max_samples = int(max_region_duration * WHISPER_SAMPLE_RATE)
+        
+        regions = []
+        for start, end in gate.regions(audio):
+            end = min(end, len(audio))
+            # Merge with the previous region while the combined span still fits
+            if regions and end - regions[-1][0] <= max_samples:
+                regions[-1][1] = end
+                continue
+            # Cut regions that are too long on their own
+            while end - start > max_samples:
+                regions.append([start, start + max_samples])
+                start += max_samples
+            regions.append([start, end])
+        
+        return [(start, end) for start, end in regions]
+    
+    def transcribe_long(self, audio_file_path: Union[str, np.ndarray], language: Optional[str] = None,
+                        max_region_duration: float = 30.0, batch_size: int = 8,
+                        pool=None, vad_detector=None) -> Dict[str, Any]:
+        """
+        Transcribe a long recording by splitting it into independent speech regions
+        
+        The audio is split at silences with VAD, the regions are transcribed
+        in parallel and the segments are stitched back together with global
+        timestamps. Regions don't condition on each other's text, which gives
+        up a little accuracy for a near-linear speedup over Whisper's
+        sequential 30-second decode.
         
         Args:
-            audio_data: Raw audio data in bytes
+            audio_file_path: Path to the audio file or decoded 16 kHz float32 samples
             language: Language code (optional, auto-detect if not provided)
-            
+            max_region_duration: Longest region in seconds (30 fits one Whisper window)
+            batch_size: Regions decoded together per forward pass when running in-process
+            pool: TranscriptionPool to spread the regions over worker processes
+                (optional, batched in this process if not provided)
+            vad_detector: Frame detector used to find speech (optional, energy based by default)
+        
         Returns:
             Dictionary containing transcription results
         """
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-            temp_file.write(audio_data)
-            temp_file_path = temp_file.name
-        
         try:
-            # Transcribe the temporary file
-            result = self.transcribe_audio(temp_file_path, language)
-            return result
+            audio = self._load_input(audio_file_path)
+            regions = self._plan_regions(audio, max_region_duration, vad_detector)
+            chunks = [audio[start:end] for start, end in regions]
             
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            # Threads can't share one Whisper model (decoding installs kv-cache
+            # hooks on it), so run the regions as a batch or in worker processes
+            if pool is not None:
+                region_results = pool.transcribe_arrays(chunks, language)
+            else:
+                region_results = self.transcribe_batch(chunks, language, batch_size)
+        
+        except Exception as e:
+            return self._error_result(e)
+        
+        segments = []
+        languages = Counter()
+        for (start, _), result in zip(regions, region_results):
+            if not result['success']:
+                return result
+            
+            offset = start / WHISPER_SAMPLE_RATE
+            languages[result['language']] += 1
+            for segment in result['segments']:
+                segment = dict(segment)
+                segment['id'] = len(segments)
+                segment['start'] += offset
+                segment['end'] += offset
+                if 'seek' in segment:
+                    segment['seek'] += start // whisper.audio.HOP_LENGTH
+                segments.append(segment)
+        
+        return {
+            'success': True,
+            'text': ' '.join(segment['text'].strip() for segment in segments if segment['text'].strip()),
+            'language': languages.most_common(1)[0][0] if languages else (language or 'unknown'),
+            'segments': segments,
+            'error': None
+        }
     
     def get_supported_languages(self) -> Dict[str, str]:
         """
@@ -114,53 +1009,124 @@ class gmtSpeechReco:
         """
         return self.supported_languages.copy()
     
-    def record_audio(self, duration: int = 5, sample_rate: int = 16000, channels: int = 1) -> str:
+    def get_capture(self, sample_rate: int = WHISPER_SAMPLE_RATE, channels: int = 1) -> AudioCapture:
         """
-        Record audio from microphone for specified duration
+        Get the recognizer's microphone capture, opening the device on first use
+        
+        The device stays open between recordings so each one starts
+        instantly; call close_capture() to release it.
+        
+        Args:
+            sample_rate: Audio sample rate
+            channels: Number of audio channels captured (downmixed to mono)
+        
+        Returns:
+            Running AudioCapture
+        """
+        capture = self._capture
+        if capture is not None and (capture.sample_rate != sample_rate
+                                    or capture.channels != channels or not capture.running):
+            capture.close()
+            capture = None
+        
+        if capture is None:
+            capture = AudioCapture(sample_rate, channels, buffer_seconds=self.CAPTURE_BUFFER_SECONDS)
+            capture.start()
+            self._capture = capture
+        
+        return capture
+    
+    def close_capture(self):
+        """
+        Release the microphone held open by get_capture
+        """
+        if self._capture is not None:
+            self._capture.close()
+            self._capture = None
+    
+    def make_denoiser(self, sample_rate: int = WHISPER_SAMPLE_RATE) -> Optional[StreamingDenoiser]:
+        """
+        New denoiser for one capture stream
+        
+        Returns:
+            A StreamingDenoiser, or None if noise_reduction is off
+        """
+        return StreamingDenoiser(sample_rate) if self.noise_reduction else None
+    
+    def make_input_pipeline(self, sample_rate: int = WHISPER_SAMPLE_RATE) -> AudioPipeline:
+        """
+        Streaming stages that turn one input stream into clean 16 kHz audio
+        
+        Args:
+            sample_rate: Rate of the incoming mono audio
+        
+        Returns:
+            AudioPipeline resampling to 16 kHz (if needed) and then denoising
+            (if noise_reduction is on)
+        """
+        resampler = StreamingResampler(sample_rate) if sample_rate != WHISPER_SAMPLE_RATE else None
+        return AudioPipeline([resampler, self.make_denoiser()])
+    
+    def _open_capture_stream(self) -> Tuple[AudioCapture, AudioPipeline]:
+        """
+        Microphone capture at capture_sample_rate plus the pipeline bringing it to 16 kHz
+        """
+        capture = self.get_capture(self.capture_sample_rate, self.capture_channels)
+        return capture, self.make_input_pipeline(capture.sample_rate)
+    
+    def record_array(self, duration: float = 5, sample_rate: int = WHISPER_SAMPLE_RATE,
+                     channels: int = 1) -> np.ndarray:
+        """
+        Record audio from microphone for specified duration into memory
         
         Args:
             duration: Recording duration in seconds
             sample_rate: Audio sample rate
-            channels: Number of audio channels
-            
+            channels: Number of audio channels (downmixed to mono)
+        
         Returns:
-            Path to the recorded audio file
+            Mono float32 samples
         """
         print(f"Recording audio for {duration} seconds...")
         print("Speak now!")
         
-        # Audio parameters
-        chunk = 1024
-        format = pyaudio.paInt16
+        capture = self.get_capture(sample_rate, channels)
+        count = int(sample_rate * duration)
+        audio = np.empty(count, dtype=np.float32)
         
-        # Initialize PyAudio
-        p = pyaudio.PyAudio()
-        
-        # Open stream
-        stream = p.open(format=format,
-                       channels=channels,
-                       rate=sample_rate,
-                       input=True,
-                       frames_per_buffer=chunk)
+        # Copy each second out of the ring buffer as it arrives, so recordings
+        # can be longer than the buffer
+        start = capture.position
+        copied = 0
+        while copied < count:
+            # Progress indicator
+            print(f"Recording: {copied // sample_rate}s/{duration}s", end='\r')
+            block = min(sample_rate, count - copied)
+            if not capture.wait_for(start + copied + block, timeout=2):
+                raise IOError("Audio input stream stopped")
+            audio[copied:copied + block] = capture.read(start + copied, block)
+            copied += block
         
-        frames = []
+        print("\nRecording finished!")
         
-        # Record for specified duration
-        for i in range(0, int(sample_rate / chunk * duration)):
-            data = stream.read(chunk, exception_on_overflow=False)
-            frames.append(data)
-            
-            # Progress indicator
-            if i % (sample_rate // chunk) == 0:
-                seconds_elapsed = i * chunk // sample_rate
-                print(f"Recording: {seconds_elapsed}s/{duration}s", end='\r')
+        denoiser = self.make_denoiser(sample_rate)
+        if denoiser is not None:
+            audio = np.concatenate((denoiser.process(audio), denoiser.flush()))
+        return audio
+    
+    def record_audio(self, duration: int = 5, sample_rate: int = 16000, channels: int = 1) -> str:
+        """
+        Record audio from microphone for specified duration
         
-        print("\nRecording finished!")
+        Args:
+            duration: Recording duration in seconds
+            sample_rate: Audio sample rate
+            channels: Number of audio channels (downmixed to mono)
         
-        # Stop and close the stream
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+        Returns:
+            Path to the recorded (mono, 16-bit) audio file
+        """
+        audio = self.record_array(duration, sample_rate, channels)
         
         # Save to temporary file
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
@@ -169,10 +1135,10 @@ class gmtSpeechReco:
         
         # Write audio data to file
         wf = wave.open(temp_file_path, 'wb')
-        wf.setnchannels(channels)
-        wf.setsampwidth(p.get_sample_size(format))
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
         wf.setframerate(sample_rate)
-        wf.writeframes(b''.join(frames))
+        wf.writeframes((np.clip(audio, -1.0, 1.0) * 32767).astype('<i2').tobytes())
         wf.close()
         
         return temp_file_path
@@ -184,85 +1150,829 @@ class gmtSpeechReco:
         Args:
             duration: Recording duration in seconds
             language: Language code (optional, auto-detect if not provided)
-            
+        
         Returns:
             Dictionary containing transcription results
         """
         try:
-            # Record audio
-            audio_file = self.record_audio(duration)
+            # Record audio at the device rate and bring it to 16 kHz
+            audio = self.record_array(duration, self.capture_sample_rate, self.capture_channels)
+            if self.capture_sample_rate != WHISPER_SAMPLE_RATE:
+                audio = resample(audio, self.capture_sample_rate)
             
             # Transcribe the recorded audio
-            result = self.transcribe_audio(audio_file, language)
-            
-            # Clean up the temporary file
-            if os.path.exists(audio_file):
-                os.unlink(audio_file)
-            
-            return result
-            
+            return self.transcribe_array(audio, language)
+        
         except Exception as e:
-            return {
-                'success': False,
-                'text': '',
-                'language': None,
-                'segments': [],
-                'error': str(e)
-            }
+            return self._error_result(e)
+    
+    def iter_realtime_results(self, chunk_duration: float = 3, language: Optional[str] = None,
+                              vad: Optional[VoiceActivityGate] = None,
+                              stop_event: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Capture from the microphone and yield a transcription result per chunk
+        
+        The microphone keeps filling the capture ring buffer from PortAudio's
+        callback thread, so audio is still recorded while Whisper works on
+        the previous chunk.
+        
+        Args:
+            chunk_duration: Duration of each audio chunk in seconds
+            language: Language code (optional, auto-detect if not provided)
+            vad: Voice activity gate; chunks without speech are not transcribed
+                and only the speech regions of the rest are sent to Whisper
+            stop_event: Ends the iteration when set (optional)
+        
+        Yields:
+            Dictionary containing transcription results for each chunk with speech
+        """
+        try:
+            capture, pipeline = self._open_capture_stream()
+            for chunk in capture.iter_blocks(int(capture.sample_rate * chunk_duration), stop_event):
+                chunk = pipeline.process(chunk)
+                if vad is not None:
+                    chunk = vad.process(chunk)
+                    if chunk is None:
+                        continue
+                
+                yield self.transcribe_array(chunk, language)
+        
+        except (IOError, OSError) as e:
+            yield self._error_result(e)
+    
+    def iter_utterance_results(self, language: Optional[str] = None,
+                               segmenter: Optional[UtteranceSegmenter] = None,
+                               block_duration: float = 0.1,
+                               stop_event: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Capture from the microphone and yield a transcription result per spoken utterance
+        
+        Instead of fixed-length chunks, audio is split where the speaker
+        pauses, so each Whisper call gets one complete utterance and short
+        commands are transcribed as soon as the speaker stops.
+        
+        Args:
+            language: Language code (optional, auto-detect if not provided)
+            segmenter: Endpointing segmenter (optional, default settings if not provided)
+            block_duration: Seconds of audio handed to the segmenter at a time
+            stop_event: Ends the iteration when set (optional)
+        
+        Yields:
+            Dictionary containing transcription results for each utterance
+        """
+        segmenter = segmenter if segmenter is not None else UtteranceSegmenter()
+        
+        try:
+            capture, pipeline = self._open_capture_stream()
+            for block in capture.iter_blocks(int(capture.sample_rate * block_duration), stop_event):
+                for utterance in segmenter.feed(pipeline.process(block)):
+                    yield self.transcribe_array(utterance, language)
+            
+            for utterance in segmenter.feed(pipeline.flush()):
+                yield self.transcribe_array(utterance, language)
+            utterance = segmenter.flush()
+            if utterance is not None:
+                yield self.transcribe_array(utterance, language)
+        
+        except (IOError, OSError) as e:
+            utterance = segmenter.flush()
+            if utterance is not None:
+                yield self.transcribe_array(utterance, language)
+            yield self._error_result(e)
     
-    def start_realtime_recognition(self, chunk_duration: int = 3, language: Optional[str] = None):
+    def _realtime_results(self, chunk_duration: Optional[float], language: Optional[str],
+                          use_vad: bool, vad_detector, silence_duration: float,
+                          max_utterance_duration: float,
+                          stop_event: Optional[threading.Event] = None):
+        """
+        Pick the fixed-chunk or utterance iterator for the real-time options
+        
+        Returns:
+            (result iterator, VAD stage with stats() or None)
+        """
+        if chunk_duration:
+            vad = VoiceActivityGate(vad_detector) if use_vad else None
+            return self.iter_realtime_results(chunk_duration, language, vad, stop_event), vad
+        
+        segmenter = UtteranceSegmenter(vad_detector, silence_duration=silence_duration,
+                                       max_duration=max_utterance_duration)
+        return self.iter_utterance_results(language, segmenter, stop_event=stop_event), segmenter
+    
+    def start_realtime_recognition(self, chunk_duration: Optional[float] = None,
+                                   language: Optional[str] = None, use_vad: bool = True,
+                                   vad_detector=None, silence_duration: float = 0.6,
+                                   max_utterance_duration: float = 15.0):
         """
         Start real-time speech recognition
-        Records and transcribes audio in chunks
+        Records and transcribes audio while capturing the next part of the
+        stream. By default audio is split into utterances at pauses; pass
+        chunk_duration to use fixed-length chunks instead.
         
         Args:
             chunk_duration: Duration of each audio chunk in seconds
+                (optional, split on pauses if not provided)
             language: Language code (optional, auto-detect if not provided)
+            use_vad: Skip silence with voice activity detection before transcribing
+                (always on when splitting on pauses)
+            vad_detector: Frame detector for the VAD (optional, energy based by default)
+            silence_duration: Pause in seconds that ends an utterance
+            max_utterance_duration: Longest utterance in seconds
         """
         print("Starting real-time speech recognition...")
         print("Press Ctrl+C to stop")
         
+        results, vad = self._realtime_results(chunk_duration, language, use_vad, vad_detector,
+                                              silence_duration, max_utterance_duration)
+        
         try:
-            while True:
-                # Record a chunk of audio
-                print(f"\nRecording {chunk_duration} second chunk...")
-                result = self.record_and_transcribe(chunk_duration, language)
-                
+            for result in results:
                 if result['success'] and result['text'].strip():
                     print(f"Transcription: {result['text']}")
                     print(f"Language: {self.supported_languages.get(result['language'], result['language'])}")
                 elif result['error']:
                     print(f"Error: {result['error']}")
-                
+        
         except KeyboardInterrupt:
             print("\nReal-time recognition stopped.")
+        
+        if vad is not None:
+            stats = vad.stats()
+            print(f"Skipped {stats['skipped_seconds']:.1f}s of {stats['total_seconds']:.1f}s audio as silence")
+    
+    def iter_streaming_results(self, language: Optional[str] = None, min_chunk_duration: float = 0.5,
+                               transcriber: Optional['StreamingTranscriber'] = None,
+                               stop_event: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Capture from the microphone and yield partial and committed text as it is spoken
+        
+        Every min_chunk_duration seconds (or as soon as the previous decode
+        finishes, if that took longer) all newly captured audio is appended
+        to a StreamingTranscriber and the growing buffer is decoded again.
+        
+        Args:
+            language: Language code (optional, auto-detect if not provided)
+            min_chunk_duration: Least new audio in seconds between decodes
+            transcriber: Streaming transcriber (optional, default settings if not provided)
+            stop_event: Ends the iteration when set (optional)
+        
+        Yields:
+            Dictionaries with 'committed' (newly stable text), 'partial'
+            (unstable tail) and 'text' (everything committed so far)
+        """
+        transcriber = transcriber if transcriber is not None else StreamingTranscriber(self, language)
+        try:
+            capture, pipeline = self._open_capture_stream()
+            min_frames = int(capture.sample_rate * min_chunk_duration)
+            read_pos = capture.position
+            
+            while stop_event is None or not stop_event.is_set():
+                if not capture.wait_for(read_pos + min_frames, timeout=0.5):
+                    if not capture.running:
+                        raise IOError("Audio input stream stopped")
+                    continue
+                
+                # Take everything captured since the last decode (if we fell
+                # more than half the ring buffer behind, skip the oldest audio)
+                end = capture.position
+                read_pos = max(read_pos, end - capture.capacity // 2)
+                transcriber.insert_audio(pipeline.process(capture.read(read_pos, end - read_pos)))
+                read_pos = end
+                
+                yield transcriber.process_iter()
+            
+            transcriber.insert_audio(pipeline.flush())
+            yield transcriber.finish()
+        
+        except (IOError, OSError) as e:
+            yield self._error_result(e)
+    
+    def start_streaming_recognition(self, language: Optional[str] = None, min_chunk_duration: float = 0.5):
+        """
+        Start streaming speech recognition
+        Prints a live partial transcript that is updated while the speaker
+        talks, and each stable piece of text once it is committed
+        
+        Args:
+            language: Language code (optional, auto-detect if not provided)
+            min_chunk_duration: Least new audio in seconds between decodes
+        """
+        print("Starting streaming speech recognition...")
+        print("Press Ctrl+C to stop")
+        
+        try:
+            for result in self.iter_streaming_results(language, min_chunk_duration):
+                if not result['success']:
+                    print(f"\nError: {result['error']}")
+                    continue
+                if result['committed']:
+                    print(f"\rTranscription: {result['committed']}")
+                if result['partial']:
+                    print(f"\r... {result['partial']}", end='', flush=True)
+        
+        except KeyboardInterrupt:
+            print("\nStreaming recognition stopped.")
+    
+    def first_window_mel(self, audio: Union[str, np.ndarray, torch.Tensor]) -> torch.Tensor:
+        """
+        Compute the log-Mel spectrogram of the first 30 seconds of audio
+        
+        Args:
+            audio: Path to the audio file, decoded 16 kHz float32 samples, or
+                an already computed log-Mel spectrogram (returned as is)
+        
+        Returns:
+            Log-Mel spectrogram on the model's device
+        """
+        model = self.model
+        if isinstance(audio, torch.Tensor) and audio.ndim == 2 and audio.shape[0] == model.dims.n_mels:
+            return audio.to(model.device)
+        
+        # Log-Mel of the first 30 seconds on the model's device; padding frames aren't transformed
+        return self.mel_frontend.log_mel(self._first_window_audio(audio), N_FRAMES)
+    
+    @staticmethod
+    def _first_window_audio(audio: Union[str, np.ndarray], timer=NULL_TIMER) -> np.ndarray:
+        """
+        Samples of the first 30 seconds of a file path or decoded array
+        """
+        if not isinstance(audio, str):
+            return audio[:whisper.audio.N_SAMPLES]
+        
+        with timer.stage('audio_decode'):
+            reader = WavStreamReader.open(audio)
+        if reader is not None:
+            # Only read the first window instead of decoding the whole file
+            with reader:
+                return gmtSpeechReco._read_first_window(reader, timer)
+        return gmtSpeechReco._load_file(audio, timer)[:whisper.audio.N_SAMPLES]
+    
+    @staticmethod
+    def _read_first_window(reader: WavStreamReader, timer=NULL_TIMER) -> np.ndarray:
+        """
+        First 30 seconds of a WAV file as 16 kHz samples
+        """
+        if reader.sample_rate == WHISPER_SAMPLE_RATE:
+            with timer.stage('audio_decode'):
+                return reader.read(0, whisper.audio.N_SAMPLES)
+        count = -(-whisper.audio.N_SAMPLES * reader.sample_rate // WHISPER_SAMPLE_RATE)
+        with timer.stage('audio_decode'):
+            audio = reader.read(0, count)
+        with timer.stage('resample'):
+            return resample(audio, reader.sample_rate)[:whisper.audio.N_SAMPLES]
     
-    def detect_language(self, audio_file_path: str) -> str:
+    def detect_language(self, audio_file_path: Union[str, np.ndarray, torch.Tensor]) -> str:
         """
         Detect the language of the audio
         
         Args:
-            audio_file_path: Path to the audio file
+            audio_file_path: Path to the audio file, decoded 16 kHz float32
+                samples, or a log-Mel spectrogram from first_window_mel
+                (whisper backend only)
+        
+        Returns:
+            Language code
+        """
+        with self._timing('detect_language') as timer:
+            try:
+                features = audio_file_path
+                if isinstance(features, str):
+                    features = self._first_window_audio(features, timer)
+                
+                if self.backend == WHISPER_BACKEND:
+                    with timer.stage('mel'):
+                        features = self.first_window_mel(features)
+                else:
+                    # Other backends compute their own features from the samples
+                    features = self._first_window_audio(features)
+                
+                # Detect the spoken language
+                with self.model_lock, timer.model_stages(self.model):
+                    _, probs = self.model.detect_language(features)
+                detected_lang = max(probs, key=probs.get)
+                
+                return detected_lang
             
+            except Exception as e:
+                return 'unknown'
+    
+    def detect_language_data(self, audio_data: bytes, sample_rate: Optional[int] = None,
+                             channels: int = 1) -> str:
+        """
+        Detect the language of audio data (bytes)
+        
+        Args:
+            audio_data: Raw audio data in bytes (a complete audio file, or
+                headerless 16-bit PCM when sample_rate is given)
+            sample_rate: Sample rate of headerless PCM data
+            channels: Interleaved channels in headerless PCM data
+        
         Returns:
             Language code
         """
+        with self._timing('detect_language_data') as timer:
+            try:
+                audio = self._decode_audio_data(audio_data, sample_rate, channels, timer)
+                if audio is None:
+                    with timer.stage('audio_decode'):
+                        audio = ffmpeg_decode_bytes(audio_data)
+            except (ValueError, RuntimeError):
+                return 'unknown'
+            
+            if audio is not None:
+                return self.detect_language(audio)
+            
+            # MP4-family containers go to ffmpeg through a temporary file
+            with timer.stage('temp_file'):
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+                    temp_file.write(audio_data)
+                    temp_file_path = temp_file.name
+            
+            try:
+                return self.detect_language(temp_file_path)
+            finally:
+                with timer.stage('temp_file'):
+                    if os.path.exists(temp_file_path):
+                        os.unlink(temp_file_path)
+    
+    def detect_and_transcribe(self, audio_file_path: Union[str, np.ndarray],
+                              language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Detect the language and transcribe, decoding the audio only once
+        
+        The file is decoded a single time; its first window is used for
+        detection and the detected language is passed to Whisper so it
+        doesn't run its own detection pass.
+        
+        Args:
+            audio_file_path: Path to the audio file or decoded 16 kHz float32 samples
+            language: Language code (optional, skips detection if provided)
+        
+        Returns:
+            Dictionary containing transcription results
+        """
+        with self._timing('detect_and_transcribe') as timer:
+            try:
+                audio = self._load_input(audio_file_path, timer)
+                
+                if not language:
+                    language = self.detect_language(audio)
+            
+            except Exception as e:
+                return timer.annotate(self._error_result(e))
+            
+            # Use the detected language even if it's outside supported_languages
+            return timer.annotate(self._transcribe(audio, language if language != 'unknown' else None,
+                                                   restrict_language=False))
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, self.async_workers),
+                                                thread_name_prefix="gmtSpeechReco")
+        return self._executor
+    
+    def _async_limit(self) -> asyncio.Semaphore:
+        """
+        The max_in_flight semaphore for the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_limits_lock:
+            limit = self._async_limits.get(loop)
+            if limit is None:
+                # Forget loops that have been closed (e.g. by earlier asyncio.run calls)
+                for stale in [other for other in self._async_limits if other.is_closed()]:
+                    del self._async_limits[stale]
+                limit = self._async_limits[loop] = asyncio.Semaphore(max(1, self.max_in_flight))
+        return limit
+    
+    async def _run_async(self, func, *args, **kwargs):
+        """
+        Run a blocking method on the managed executor, limited to max_in_flight at once
+        """
+        async with self._async_limit():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+    
+    async def atranscribe_audio(self, audio_file_path: str, language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async version of transcribe_audio
+        """
+        return await self._run_async(self.transcribe_audio, audio_file_path, language)
+    
+    async def atranscribe_audio_data(self, audio_data: bytes, language: Optional[str] = None,
+                                     sample_rate: Optional[int] = None, channels: int = 1) -> Dict[str, Any]:
+        """
+        Async version of transcribe_audio_data
+        
+        With micro-batching enabled, in-memory audio is decoded on the
+        executor and clips of up to 30 seconds are then queued on the
+        batcher directly, so concurrent requests aren't limited by the
+        executor size while waiting for the model.
+        """
+        if self.batcher is not None:
+            async with self._async_limit():
+                loop = asyncio.get_running_loop()
+                try:
+                    # Decoding and resampling can take a while; keep them off the event loop
+                    audio = await loop.run_in_executor(
+                        self._get_executor(),
+                        functools.partial(self._decode_audio_data, audio_data, sample_rate, channels))
+                except ValueError as e:
+                    return self._error_result(e)
+                if audio is not None:
+                    if len(audio) <= whisper.audio.N_SAMPLES:
+                        return await asyncio.wrap_future(self.batcher.submit(audio, language))
+                    return await loop.run_in_executor(
+                        self._get_executor(), functools.partial(self.transcribe_array, audio, language))
+        
+        return await self._run_async(self.transcribe_audio_data, audio_data, language, sample_rate, channels)
+    
+    async def atranscribe_array(self, audio: np.ndarray, language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async version of transcribe_array
+        """
+        return await self._run_async(self.transcribe_array, audio, language)
+    
+    async def adetect_language(self, audio_file_path: Union[str, np.ndarray, torch.Tensor]) -> str:
+        """
+        Async version of detect_language
+        """
+        return await self._run_async(self.detect_language, audio_file_path)
+    
+    async def adetect_language_data(self, audio_data: bytes, sample_rate: Optional[int] = None,
+                                    channels: int = 1) -> str:
+        """
+        Async version of detect_language_data
+        """
+        return await self._run_async(self.detect_language_data, audio_data, sample_rate, channels)
+    
+    async def adetect_and_transcribe(self, audio_file_path: Union[str, np.ndarray],
+                                     language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async version of detect_and_transcribe
+        """
+        return await self._run_async(self.detect_and_transcribe, audio_file_path, language)
+    
+    async def aiter_realtime_results(self, chunk_duration: Optional[float] = None,
+                                     language: Optional[str] = None, use_vad: bool = True,
+                                     vad_detector=None, silence_duration: float = 0.6,
+                                     max_utterance_duration: float = 15.0,
+                                     max_queued: int = 16) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async iterator over real-time microphone results
+        
+        Capture and transcription run on a dedicated thread; results are
+        handed to the event loop through a bounded queue, so a slow consumer
+        holds back transcription instead of piling up results.
+        
+        Args:
+            chunk_duration: Duration of each audio chunk in seconds
+                (optional, split on pauses if not provided)
+            language: Language code (optional, auto-detect if not provided)
+            use_vad: Skip silence with voice activity detection (fixed chunks only)
+            vad_detector: Frame detector for the VAD (optional, energy based by default)
+            silence_duration: Pause in seconds that ends an utterance
+            max_utterance_duration: Longest utterance in seconds
+            max_queued: Results buffered for the consumer
+        
+        Yields:
+            Dictionary containing transcription results
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(max(1, max_queued))
+        stop_event = threading.Event()
+        finished = object()
+        
+        def produce():
+            try:
+                results, _ = self._realtime_results(chunk_duration, language, use_vad, vad_detector,
+                                                    silence_duration, max_utterance_duration, stop_event)
+                for result in results:
+                    # Block this thread (not the loop) while the queue is full
+                    asyncio.run_coroutine_threadsafe(queue.put(result), loop).result()
+                    if stop_event.is_set():
+                        break
+            except Exception as e:
+                asyncio.run_coroutine_threadsafe(queue.put(self._error_result(e)), loop)
+            finally:
+                try:
+                    asyncio.run_coroutine_threadsafe(queue.put(finished), loop)
+                except RuntimeError:
+                    # The event loop is already closed
+                    pass
+        
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        
         try:
-            # Load audio and pad/trim it to fit 30 seconds
-            audio = whisper.load_audio(audio_file_path)
-            audio = whisper.pad_or_trim(audio)
+            while True:
+                result = await queue.get()
+                if result is finished:
+                    break
+                yield result
+        finally:
+            stop_event.set()
+            # Unblock a producer waiting on a full queue so it can see the stop
+            while not queue.empty():
+                queue.get_nowait()
+    
+    def enable_micro_batching(self, max_batch: int = 8, max_wait: float = 0.01) -> 'MicroBatcher':
+        """
+        Batch concurrent transcribe_audio_data requests through one forward pass
+        
+        Requests arriving within max_wait seconds of each other (up to
+        max_batch of them) are decoded together. Batched requests are
+        decoded as one 30-second window without timestamps or temperature
+        fallback, which suits short voice commands; longer clips are
+        transcribed normally.
+        
+        Args:
+            max_batch: Most requests decoded together
+            max_wait: Longest time in seconds the first request of a batch waits for others
+        
+        Returns:
+            The running MicroBatcher
+        """
+        if self.batcher is not None:
+            self.batcher.close()
+        self.batcher = MicroBatcher(self, max_batch, max_wait)
+        return self.batcher
+    
+    def disable_micro_batching(self):
+        """
+        Go back to running each request on its own
+        """
+        if self.batcher is not None:
+            self.batcher.close()
+            self.batcher = None
+    
+    def close(self):
+        """
+        Release the microphone, the async executor and the micro-batcher
+        """
+        self.close_capture()
+        self.disable_micro_batching()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class MicroBatcher:
+    """
+    Collect concurrent requests for a short window and decode them as one batch
+    
+    A scheduler thread waits for the first request, keeps collecting until
+    max_batch requests are queued or max_wait seconds have passed, then
+    runs them through gmtSpeechReco.transcribe_batch and resolves each
+    request's future with its own result.
+    """
+    
+    def __init__(self, recognizer: gmtSpeechReco, max_batch: int = 8, max_wait: float = 0.01):
+        """
+        Args:
+            recognizer: Recognizer whose model runs the batches
+            max_batch: Most requests decoded together
+            max_wait: Longest time in seconds the first request of a batch waits for others
+        """
+        self.recognizer = recognizer
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.batches = 0
+        self.requests = 0
+        self._thread = threading.Thread(target=self._run, name="MicroBatcher", daemon=True)
+        self._thread.start()
+    
+    def submit(self, audio: np.ndarray, language: Optional[str] = None) -> Future:
+        """
+        Queue a request
+        
+        Args:
+            audio: Mono float32 samples at 16 kHz
+            language: Language code (optional, auto-detect if not provided)
+        
+        Returns:
+            Future resolving to the transcription result dictionary
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._pending.append((time.monotonic(), audio, language, future))
+            self._condition.notify()
+        return future
+    
+    def _next_batch(self) -> List[Tuple[float, np.ndarray, Optional[str], Future]]:
+        with self._condition:
+            while not self._pending and not self._closed:
+                self._condition.wait()
+            if not self._pending:
+                return []
+            
+            # Wait for more requests until the oldest one has waited max_wait
+            deadline = self._pending[0][0] + self.max_wait
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
             
-            # Make log-Mel spectrogram and move to the same device as the model
-            mel = whisper.log_mel_spectrogram(audio).to(self.model.device)
+            return [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+    
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            
+            # Skip requests whose callers have given up
+            batch = [request for request in batch if request[3].set_running_or_notify_cancel()]
             
-            # Detect the spoken language
-            _, probs = self.model.detect_language(mel)
-            detected_lang = max(probs, key=probs.get)
+            # The decoding language is per batch, so split by requested language
+            groups: Dict[Optional[str], List[Tuple[np.ndarray, Future]]] = {}
+            for _, audio, language, future in batch:
+                groups.setdefault(language, []).append((audio, future))
             
-            return detected_lang
+            for language, requests in groups.items():
+                try:
+                    results = self.recognizer.transcribe_batch(
+                        [audio for audio, _ in requests], language, batch_size=self.max_batch)
+                except Exception as e:
+                    results = [self.recognizer._error_result(e)] * len(requests)
+                
+                for (_, future), result in zip(requests, results):
+                    future.set_result(result)
             
+            self.batches += 1
+            self.requests += len(batch)
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Number of batches run and the average batch size
+        """
+        return {
+            'batches': self.batches,
+            'requests': self.requests,
+            'average_batch_size': self.requests / self.batches if self.batches else 0.0,
+        }
+    
+    def close(self):
+        """
+        Finish the queued requests and stop the scheduler thread
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription of a growing audio buffer with a local-agreement commit policy
+    
+    Each call to process_iter re-decodes the uncommitted audio. Words on
+    which two consecutive hypotheses agree (their longest common prefix)
+    are committed and never change again; the rest is reported as an
+    unstable partial. Audio up to the last committed word is trimmed from
+    the buffer once it grows past trim_duration, so every decode stays short.
+    """
+    
+    def __init__(self, recognizer: gmtSpeechReco, language: Optional[str] = None,
+                 trim_duration: float = 15.0, max_buffer_duration: float = 28.0,
+                 prompt_chars: int = 200):
+        """
+        Args:
+            recognizer: Recognizer whose model decodes the buffer
+            language: Language code (optional, detected on the first decode if not provided)
+            trim_duration: Buffer length in seconds after which committed audio is trimmed
+            max_buffer_duration: Buffer length in seconds at which the current
+                hypothesis is committed outright (must stay under Whisper's 30 s window)
+            prompt_chars: Characters of committed text passed as the decoding prompt
+        """
+        self.recognizer = recognizer
+        self.language = language
+        self.trim_duration = trim_duration
+        self.max_buffer_duration = max_buffer_duration
+        self.prompt_chars = prompt_chars
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_offset = 0.0
+        self.committed: List[Tuple[float, float, str]] = []
+        self.committed_until = 0.0
+        self._hypothesis: List[Tuple[float, float, str]] = []
+    
+    @property
+    def committed_text(self) -> str:
+        return ''.join(word for _, _, word in self.committed).strip()
+    
+    def insert_audio(self, audio: np.ndarray):
+        """
+        Append newly captured 16 kHz mono float32 audio
+        """
+        self.buffer = np.concatenate((self.buffer, np.asarray(audio, dtype=np.float32)))
+    
+    def _decode(self) -> List[Tuple[float, float, str]]:
+        """
+        Decode the buffer and return its words with absolute timestamps
+        """
+        options = {
+            'word_timestamps': True,
+            'condition_on_previous_text': False,
+            'initial_prompt': self.committed_text[-self.prompt_chars:] or None,
+        }
+        if self.language:
+            options['language'] = self.language
+        
+        recognizer = self.recognizer
+        with recognizer.model_lock:
+            result = recognizer.model.transcribe(self.buffer, **options)
+        
+        self.language = self.language or result.get('language')
+        words = []
+        for segment in result.get('segments', []):
+            for word in segment.get('words', []):
+                words.append((word['start'] + self.buffer_offset,
+                              word['end'] + self.buffer_offset, word['word']))
+        return words
+    
+    @staticmethod
+    def _same_word(a: str, b: str) -> bool:
+        return a.strip().lower().strip('.,!?;:"\'') == b.strip().lower().strip('.,!?;:"\'')
+    
+    def _commit(self, words: List[Tuple[float, float, str]]):
+        self.committed.extend(words)
+        if words:
+            self.committed_until = words[-1][1]
+    
+    def _trim(self, until: float):
+        samples = int((until - self.buffer_offset) * WHISPER_SAMPLE_RATE)
+        if samples > 0:
+            self.buffer = self.buffer[samples:]
+            self.buffer_offset += samples / WHISPER_SAMPLE_RATE
+    
+    def _event(self, committed_words: List[Tuple[float, float, str]]) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'committed': ''.join(word for _, _, word in committed_words).strip(),
+            'partial': ''.join(word for _, _, word in self._hypothesis).strip(),
+            'text': self.committed_text,
+            'language': self.language or 'unknown',
+            'error': None
+        }
+    
+    def process_iter(self) -> Dict[str, Any]:
+        """
+        Re-decode the buffer and commit the words two hypotheses agree on
+        
+        Returns:
+            Dictionary with 'committed' (text committed by this call),
+            'partial' (current unstable tail) and 'text' (all committed text)
+        """
+        if not len(self.buffer):
+            return self._event([])
+        
+        try:
+            words = self._decode()
         except Exception as e:
-            return 'unknown'
+            return self.recognizer._error_result(e)
+        
+        # Ignore words from audio that was already committed
+        words = [word for word in words if word[0] >= self.committed_until - 0.05]
+        
+        # Local agreement: commit the common prefix with the previous hypothesis
+        agreed = []
+        for previous, current in zip(self._hypothesis, words):
+            if not self._same_word(previous[2], current[2]):
+                break
+            agreed.append(current)
+        self._commit(agreed)
+        self._hypothesis = words[len(agreed):]
+        
+        buffer_duration = len(self.buffer) / WHISPER_SAMPLE_RATE
+        if buffer_duration > self.max_buffer_duration:
+            # Nothing stabilised in time; accept the hypothesis rather than overflow the window
+            forced = self._hypothesis
+            self._commit(forced)
+            agreed = agreed + forced
+            self._hypothesis = []
+            self._trim(self.committed_until if forced else self.buffer_offset + buffer_duration)
+        elif buffer_duration > self.trim_duration and self.committed_until > self.buffer_offset:
+            self._trim(self.committed_until)
+        
+        return self._event(agreed)
+    
+    def finish(self) -> Dict[str, Any]:
+        """
+        Commit whatever is left, e.g. when the stream ends
+        
+        Returns:
+            Dictionary in the same shape as process_iter
+        """
+        remaining = self._hypothesis
+        self._commit(remaining)
+        self._hypothesis = []
+        self.buffer = np.zeros(0, dtype=np.float32)
+        return self._event(remaining)
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -296,23 +2006,23 @@ if __name__ == "__main__":
                 print(f"✓ Language: {speech_recognizer.supported_languages.get(result['language'], result['language'])}")
             else:
                 print(f"✗ Error: {result['error']}")
-                
+        
         elif choice == "2":
             # Real-time recognition
-            chunk_duration = input("Chunk duration in seconds (default 3): ").strip()
-            chunk_duration = int(chunk_duration) if chunk_duration.isdigit() else 3
+            chunk_duration = input("Chunk duration in seconds (default: split on pauses): ").strip()
+            chunk_duration = int(chunk_duration) if chunk_duration.isdigit() else None
             
             lang_choice = input("Language? (en/hi/auto-detect, default auto): ").strip()
             language = lang_choice if lang_choice in ['en', 'hi'] else None
             
             speech_recognizer.start_realtime_recognition(chunk_duration, language)
-            
+        
         elif choice == "3":
             # List languages
             print("\nSupported languages:")
             for code, name in speech_recognizer.get_supported_languages().items():
                 print(f"  {code}: {name}")
-                
+        
         elif choice == "4":
             # Test with existing file
             file_path = input("Enter audio file path: ").strip()
@@ -328,10 +2038,11 @@ if __name__ == "__main__":
                     print(f"✗ Error: {result['error']}")
             else:
                 print("File not found!")
-                
+        
         elif choice == "5":
+            speech_recognizer.close()
             print("Goodbye!")
             break
-            
+        
         else:
             print("Invalid choice. Please try again.")
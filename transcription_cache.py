@@ -0,0 +1,174 @@
+import os
+import copy
+import json
+import hashlib
+import tempfile
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+
+class TranscriptionCache:
+    """
+    Content-addressed cache of transcription results
+    
+    Results are keyed by a hash of the decoded audio samples together with
+    the model and decoding settings, so re-submitting the same audio (even
+    under a different file name or container) returns the stored result.
+    An in-memory LRU tier sits in front of an optional on-disk tier.
+    """
+    
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Results kept in memory before the least recently used is evicted
+            disk_dir: Directory for the on-disk tier (optional, memory only if not provided)
+            max_disk_bytes: Size limit of the on-disk tier; oldest entries are removed beyond it
+        """
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(audio: np.ndarray, model_id: str, language: Optional[str] = None,
+                 options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a transcription request
+        
+        Args:
+            audio: Decoded float32 samples
+            model_id: Identifies the model weights (size, precision, backend)
+            language: Requested language code
+            options: Decoding options passed to the model
+        
+        Returns:
+            Hex digest identifying the request
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(memoryview(audio).cast('B'))
+        settings = json.dumps([model_id, language, options or {}], sort_keys=True, default=str)
+        digest.update(settings.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a result
+        
+        Returns:
+            A copy of the stored result dictionary, or None on a miss
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+        
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    result = json.load(f)
+                # Refresh the timestamp so eviction treats it as recently used
+                os.utime(path)
+            except (OSError, ValueError):
+                result = None
+            
+            if result is not None:
+                with self._lock:
+                    self.hits += 1
+                    self._store(key, result)
+                return copy.deepcopy(result)
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Store a successful result (failed results are not cached)
+        """
+        if not result.get('success'):
+            return
+        
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._store(key, result)
+        
+        if self.disk_dir:
+            self._write_disk(key, result)
+    
+    def _store(self, key: str, result: Dict[str, Any]):
+        # Caller holds self._lock
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(self.max_entries, 0):
+            self._entries.popitem(last=False)
+    
+    def _write_disk(self, key: str, result: Dict[str, Any]):
+        # Write to a temporary file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, default=float)
+            os.replace(temp_path, self._disk_path(key))
+        except (OSError, TypeError, ValueError):
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return
+        
+        self._evict_disk()
+    
+    def _evict_disk(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        
+        # Remove the least recently used entries until we're under budget
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+    
+    def clear(self):
+        """
+        Remove every entry from both tiers
+        """
+        with self._lock:
+            self._entries.clear()
+        
+        if self.disk_dir:
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith('.json'):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Hit/miss counters and the number of in-memory entries
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
@@ -0,0 +1,167 @@
+import os
+import multiprocessing
+import numpy as np
+import torch
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, Dict, Any, Iterable, Iterator, Tuple, List, Sequence
+
+from speechrecogniation import gmtSpeechReco
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.flac', '.ogg', '.opus', '.webm')
+
+# Recognizer owned by each worker process, created once by _init_worker
+_worker_recognizer: Optional[gmtSpeechReco] = None
+
+
+def _init_worker(model_size: str, device: Optional[str], dtype: Optional[str], backend: str,
+                 torch_threads: int):
+    """
+    Worker initializer: limit torch threads and load this process's model
+    """
+    global _worker_recognizer
+    torch.set_num_threads(torch_threads)
+    torch.set_num_interop_threads(1)
+    _worker_recognizer = gmtSpeechReco(model_size, device=device, dtype=dtype, backend=backend,
+                                       preload=True)
+
+
+def _transcribe_job(path: str, language: Optional[str]) -> Dict[str, Any]:
+    return _worker_recognizer.transcribe_audio(path, language)
+
+
+def _transcribe_array_job(audio: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+    return _worker_recognizer.transcribe_array(audio, language)
+
+
+class TranscriptionPool:
+    """
+    Transcribe many files in parallel across worker processes
+    
+    Each worker holds its own Whisper model and a fixed number of torch
+    threads, so N workers x threads_per_worker never oversubscribes the CPU.
+    """
+    
+    def __init__(self, model_size: str = "base", num_workers: Optional[int] = None,
+                 threads_per_worker: Optional[int] = None, device: Optional[str] = "cpu",
+                 dtype: Optional[str] = None, backend: str = "whisper"):
+        """
+        Start the worker processes
+        
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large)
+            num_workers: Number of worker processes (default: half the CPU cores)
+            threads_per_worker: Torch threads per worker (default: cores / workers)
+            device: Torch device for the workers' models
+            dtype: Weight precision (optional, the backend's default if not provided)
+            backend: Inference engine, "whisper" or "faster-whisper"
+        """
+        cpu_count = os.cpu_count() or 1
+        self.num_workers = num_workers or max(1, cpu_count // 2)
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.num_workers)
+        
+        # Spawn rather than fork: torch's thread pools don't survive a fork
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_size, device, dtype, backend, self.threads_per_worker),
+        )
+    
+    def submit(self, path: str, language: Optional[str] = None):
+        """
+        Queue a single file
+        
+        Returns:
+            Future resolving to the transcription result dictionary
+        """
+        return self._executor.submit(_transcribe_job, path, language)
+    
+    def transcribe_files(self, paths: Iterable[str], language: Optional[str] = None,
+                         max_pending: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Transcribe files and yield results as soon as each one finishes
+        
+        Args:
+            paths: Audio file paths
+            language: Language code (optional, auto-detect if not provided)
+            max_pending: Files queued at once (default: twice the worker count),
+                so very long path lists are not all submitted up front
+        
+        Yields:
+            (path, result) tuples in completion order
+        """
+        max_pending = max_pending or self.num_workers * 2
+        paths = iter(paths)
+        pending = {}
+        
+        while True:
+            for path in paths:
+                pending[self.submit(path, language)] = path
+                if len(pending) >= max_pending:
+                    break
+            
+            if not pending:
+                return
+            
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    yield path, future.result()
+                except Exception as e:
+                    yield path, gmtSpeechReco._error_result(e)
+    
+    def transcribe_arrays(self, arrays: Sequence[np.ndarray],
+                          language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Transcribe in-memory audio across the workers
+        
+        Args:
+            arrays: 16 kHz mono float32 arrays
+            language: Language code (optional, auto-detect if not provided)
+            
+        Returns:
+            One result dictionary per array, in input order
+        """
+        futures = [self._executor.submit(_transcribe_array_job, audio, language) for audio in arrays]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(gmtSpeechReco._error_result(e))
+        return results
+    
+    def transcribe_directory(self, directory: str, language: Optional[str] = None,
+                             extensions: Tuple[str, ...] = AUDIO_EXTENSIONS
+                             ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Transcribe every audio file under a directory
+        
+        Args:
+            directory: Directory to walk recursively
+            language: Language code (optional, auto-detect if not provided)
+            extensions: File extensions treated as audio
+        
+        Yields:
+            (path, result) tuples in completion order
+        """
+        def audio_files():
+            for root, _, files in os.walk(directory):
+                for name in sorted(files):
+                    if name.lower().endswith(extensions):
+                        yield os.path.join(root, name)
+        
+        return self.transcribe_files(audio_files(), language)
+    
+    def close(self, wait_for_pending: bool = True):
+        """
+        Shut down the worker processes
+        """
+        self._executor.shutdown(wait=wait_for_pending, cancel_futures=not wait_for_pending)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close(wait_for_pending=exc_type is None)
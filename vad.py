@@ -0,0 +1,353 @@
+import numpy as np
+from collections import deque
+from typing import Optional, List, Tuple
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+# Detectors work on the same 16 kHz mono float32 audio Whisper uses
+SAMPLE_RATE = 16000
+
+
+class EnergyVAD:
+    """
+    Frame-level voice activity detector based on energy and zero-crossing rate
+    
+    Frames are speech when they are loud enough relative to a running
+    noise-floor estimate. Frames that are only marginally above the floor
+    also need a low zero-crossing rate, which rejects hiss and fan noise.
+    """
+    
+    def __init__(self, frame_duration: float = 0.03, threshold_db: float = 10.0,
+                 min_energy_db: float = -55.0, zcr_threshold: float = 0.25,
+                 noise_adaptation: float = 0.95, max_noise_floor_db: float = -35.0):
+        """
+        Args:
+            frame_duration: Frame length in seconds
+            threshold_db: Required level above the noise floor in dB
+            min_energy_db: Absolute level (dBFS) below which a frame is never speech
+            zcr_threshold: Maximum zero-crossing rate for marginal frames
+            noise_adaptation: Smoothing factor for the noise-floor estimate (0-1)
+            max_noise_floor_db: Upper bound on the noise floor, so audio that is
+                almost all speech can't raise it to speech level
+        """
+        self.frame_duration = frame_duration
+        self.frame_size = int(SAMPLE_RATE * frame_duration)
+        self.threshold_db = threshold_db
+        self.min_energy_db = min_energy_db
+        self.zcr_threshold = zcr_threshold
+        self.noise_adaptation = noise_adaptation
+        self.max_noise_floor_db = max_noise_floor_db
+        self.noise_floor_db: Optional[float] = None
+    
+    def reset(self):
+        """
+        Forget the noise-floor estimate
+        """
+        self.noise_floor_db = None
+    
+    def speech_frames(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Classify each frame of the audio
+        
+        Args:
+            audio: Mono float32 samples at 16 kHz (a trailing partial frame is ignored)
+        
+        Returns:
+            Boolean array with one entry per frame, True for speech
+        """
+        n_frames = len(audio) // self.frame_size
+        if n_frames == 0:
+            return np.zeros(0, dtype=bool)
+        
+        frames = audio[:n_frames * self.frame_size].reshape(n_frames, self.frame_size)
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+        
+        if self.noise_floor_db is None:
+            # Bootstrap from the quietest frames of the first chunk
+            self.noise_floor_db = min(float(np.percentile(energy_db, 10)), self.max_noise_floor_db)
+        
+        above_floor = energy_db - self.noise_floor_db
+        speech = ((energy_db > self.min_energy_db)
+                  & (above_floor > self.threshold_db)
+                  & ((zcr < self.zcr_threshold) | (above_floor > 2 * self.threshold_db)))
+        
+        # Track the noise floor on the frames judged to be non-speech
+        if not speech.all():
+            level = float(np.median(energy_db[~speech]))
+            self.noise_floor_db = min(self.noise_adaptation * self.noise_floor_db
+                                      + (1.0 - self.noise_adaptation) * level,
+                                      self.max_noise_floor_db)
+        
+        return speech
+
+
+class WebRtcVAD:
+    """
+    Model-based voice activity detector using the WebRTC VAD (pip install webrtcvad)
+    """
+    
+    def __init__(self, aggressiveness: int = 2, frame_duration: float = 0.03):
+        """
+        Args:
+            aggressiveness: 0 (least) to 3 (most aggressive at filtering out non-speech)
+            frame_duration: Frame length in seconds (0.01, 0.02 or 0.03)
+        """
+        if webrtcvad is None:
+            raise ImportError("webrtcvad is not installed. Install it with: pip install webrtcvad")
+        self._vad = webrtcvad.Vad(aggressiveness)
+        self.frame_duration = frame_duration
+        self.frame_size = int(SAMPLE_RATE * frame_duration)
+    
+    def reset(self):
+        pass
+    
+    def speech_frames(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Classify each frame of the audio
+        
+        Args:
+            audio: Mono float32 samples at 16 kHz (a trailing partial frame is ignored)
+        
+        Returns:
+            Boolean array with one entry per frame, True for speech
+        """
+        n_frames = len(audio) // self.frame_size
+        pcm = (np.clip(audio[:n_frames * self.frame_size], -1.0, 1.0) * 32767).astype('<i2').tobytes()
+        step = self.frame_size * 2
+        return np.fromiter((self._vad.is_speech(pcm[i * step:(i + 1) * step], SAMPLE_RATE)
+                            for i in range(n_frames)), dtype=bool, count=n_frames)
+
+
+def speech_regions(speech: np.ndarray, frame_size: int, padding_frames: int = 10,
+                   min_speech_frames: int = 3) -> List[Tuple[int, int]]:
+    """
+    Turn per-frame speech flags into padded sample ranges
+    
+    Args:
+        speech: Boolean per-frame speech flags
+        frame_size: Samples per frame
+        padding_frames: Frames kept before and after each speech run
+        min_speech_frames: Shortest speech run kept (shorter runs are clicks)
+    
+    Returns:
+        List of (start_sample, end_sample) ranges
+    """
+    speech = np.asarray(speech, dtype=bool)
+    if not speech.any():
+        return []
+    
+    # Find runs of speech frames and drop the ones that are too short
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    keep = (ends - starts) >= min_speech_frames
+    starts, ends = starts[keep], ends[keep]
+    
+    regions = []
+    for start, end in zip(np.maximum(starts - padding_frames, 0),
+                          np.minimum(ends + padding_frames, len(speech))):
+        # Merge regions whose padding overlaps
+        if regions and start <= regions[-1][1]:
+            regions[-1][1] = max(regions[-1][1], end)
+        else:
+            regions.append([start, end])
+    
+    return [(int(start) * frame_size, int(end) * frame_size) for start, end in regions]
+
+
+class VoiceActivityGate:
+    """
+    Forward only the speech portions of audio chunks to the recognizer
+    
+    Keeps running totals of how much audio was seen and skipped.
+    """
+    
+    def __init__(self, detector=None, padding: float = 0.3, min_speech: float = 0.1):
+        """
+        Args:
+            detector: Frame classifier with frame_size and speech_frames(audio)
+                (defaults to EnergyVAD)
+            padding: Seconds of audio kept around each speech region
+            min_speech: Shortest speech run in seconds that opens a region
+        """
+        self.detector = detector if detector is not None else EnergyVAD()
+        self.padding_frames = int(round(padding / self.detector.frame_duration))
+        self.min_speech_frames = max(1, int(round(min_speech / self.detector.frame_duration)))
+        self.total_samples = 0
+        self.speech_samples = 0
+    
+    def regions(self, audio: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Find speech regions in the audio
+        
+        Returns:
+            List of (start_sample, end_sample) ranges
+        """
+        speech = self.detector.speech_frames(audio)
+        return speech_regions(speech, self.detector.frame_size,
+                              self.padding_frames, self.min_speech_frames)
+    
+    def process(self, audio: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Strip non-speech from a chunk
+        
+        Returns:
+            The speech regions joined together, or None if the chunk has no speech
+        """
+        regions = self.regions(audio)
+        self.total_samples += len(audio)
+        
+        if not regions:
+            return None
+        
+        speech = np.concatenate([audio[start:end] for start, end in regions])
+        self.speech_samples += len(speech)
+        return speech
+    
+    @property
+    def skipped_seconds(self) -> float:
+        return (self.total_samples - self.speech_samples) / SAMPLE_RATE
+    
+    def stats(self) -> dict:
+        """
+        Totals of audio processed and skipped, in seconds
+        """
+        total = self.total_samples / SAMPLE_RATE
+        return {
+            'total_seconds': total,
+            'speech_seconds': self.speech_samples / SAMPLE_RATE,
+            'skipped_seconds': self.skipped_seconds,
+            'skipped_ratio': self.skipped_seconds / total if total else 0.0,
+        }
+
+
+class UtteranceSegmenter:
+    """
+    Split a continuous audio stream into utterances at natural pauses
+    
+    An utterance opens on the first speech frame (including pre_roll seconds
+    of audio from before it) and closes after silence_duration seconds of
+    trailing silence or once it reaches max_duration.
+    """
+    
+    def __init__(self, detector=None, silence_duration: float = 0.6, max_duration: float = 15.0,
+                 pre_roll: float = 0.3, min_speech: float = 0.2):
+        """
+        Args:
+            detector: Frame classifier with frame_size and speech_frames(audio)
+                (defaults to EnergyVAD)
+            silence_duration: Trailing silence in seconds that ends an utterance
+            max_duration: Longest utterance in seconds before it is force-closed
+            pre_roll: Seconds of audio kept before speech starts (and after it ends)
+            min_speech: Utterances with less speech than this (seconds) are dropped
+        """
+        self.detector = detector if detector is not None else EnergyVAD()
+        frame_duration = self.detector.frame_duration
+        self.frame_size = self.detector.frame_size
+        self.silence_frames = max(1, int(round(silence_duration / frame_duration)))
+        self.max_frames = max(1, int(round(max_duration / frame_duration)))
+        self.pre_roll_frames = int(round(pre_roll / frame_duration))
+        self.min_speech_frames = max(1, int(round(min_speech / frame_duration)))
+        self.total_samples = 0
+        self.speech_samples = 0
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._pre_roll = deque(maxlen=max(self.pre_roll_frames, 1))
+        self._frames: List[np.ndarray] = []
+        self._speech_count = 0
+        self._silence_run = 0
+    
+    @property
+    def in_utterance(self) -> bool:
+        return bool(self._frames)
+    
+    def feed(self, audio: np.ndarray) -> List[np.ndarray]:
+        """
+        Add captured audio and return any utterances it completed
+        
+        Args:
+            audio: Mono float32 samples at 16 kHz, any length
+        
+        Returns:
+            List of finished utterances (possibly empty)
+        """
+        if len(self._remainder):
+            audio = np.concatenate((self._remainder, audio))
+        n_frames = len(audio) // self.frame_size
+        self._remainder = audio[n_frames * self.frame_size:].copy()
+        if n_frames == 0:
+            return []
+        
+        audio = audio[:n_frames * self.frame_size]
+        frames = audio.reshape(n_frames, self.frame_size)
+        flags = self.detector.speech_frames(audio)
+        self.total_samples += len(audio)
+        
+        utterances = []
+        for frame, is_speech in zip(frames, flags):
+            if not self._frames:
+                if is_speech:
+                    self._frames = list(self._pre_roll) if self.pre_roll_frames else []
+                    self._frames.append(frame)
+                    self._pre_roll.clear()
+                    self._speech_count = 1
+                    self._silence_run = 0
+                else:
+                    self._pre_roll.append(frame)
+                continue
+            
+            self._frames.append(frame)
+            if is_speech:
+                self._speech_count += 1
+                self._silence_run = 0
+            else:
+                self._silence_run += 1
+            
+            if self._silence_run >= self.silence_frames or len(self._frames) >= self.max_frames:
+                utterance = self._close()
+                if utterance is not None:
+                    utterances.append(utterance)
+        
+        return utterances
+    
+    def flush(self) -> Optional[np.ndarray]:
+        """
+        Close the utterance in progress, e.g. when capture stops
+        
+        Returns:
+            The final utterance, or None if there was none
+        """
+        return self._close() if self._frames else None
+    
+    def _close(self) -> Optional[np.ndarray]:
+        # Keep at most pre_roll worth of the trailing silence
+        trailing = max(0, self._silence_run - self.pre_roll_frames)
+        frames = self._frames[:len(self._frames) - trailing]
+        speech_count = self._speech_count
+        
+        self._frames = []
+        self._speech_count = 0
+        self._silence_run = 0
+        
+        if speech_count < self.min_speech_frames:
+            return None
+        
+        utterance = np.concatenate(frames)
+        self.speech_samples += len(utterance)
+        return utterance
+    
+    def stats(self) -> dict:
+        """
+        Totals of audio processed and skipped, in seconds
+        """
+        total = self.total_samples / SAMPLE_RATE
+        skipped = (self.total_samples - self.speech_samples) / SAMPLE_RATE
+        return {
+            'total_seconds': total,
+            'speech_seconds': self.speech_samples / SAMPLE_RATE,
+            'skipped_seconds': skipped,
+            'skipped_ratio': skipped / total if total else 0.0,
+        }